@@ -1,4 +1,5 @@
 import os
+import json
 import httpx
 from typing import Optional, Dict, Any
 
@@ -75,24 +76,50 @@ async def get_traces(
 
 async def get_trace_detail(trace_id: str) -> Dict[str, Any]:
     """Fetch a single trace with all spans.
-    
+
+    Requests the payload as NDJSON so large traces stream one span per
+    line instead of arriving as a single JSON document that must be
+    fully buffered and parsed at once. Servers that don't support NDJSON
+    answer with plain JSON and are handled transparently.
+
     Parameters
     ----------
     trace_id : str
         ID of the trace to fetch.
-    
+
     Returns
     -------
     Dict[str, Any]
         Response containing trace and spans.
     """
+    headers = {**_get_headers(), "Accept": "application/x-ndjson"}
+
     async with httpx.AsyncClient(timeout=DEFAULT_TIMEOUT) as client:
-        resp = await client.get(
+        async with client.stream(
+            "GET",
             f"{API_URL}/api/traces/{trace_id}",
-            headers=_get_headers(),
-        )
-        resp.raise_for_status()
-        return resp.json()
+            headers=headers,
+        ) as resp:
+            resp.raise_for_status()
+
+            # Fallback: plain JSON response from servers w/o NDJSON support
+            if "application/x-ndjson" not in resp.headers.get("content-type", ""):
+                await resp.aread()
+                return resp.json()
+
+            # First line is the {"trace": ...} sentinel, then one span per line
+            trace: Optional[Dict[str, Any]] = None
+            spans: list = []
+            async for line in resp.aiter_lines():
+                if not line:
+                    continue
+                obj = json.loads(line)
+                if trace is None and "trace" in obj:
+                    trace = obj["trace"]
+                else:
+                    spans.append(obj)
+
+            return {"trace": trace, "spans": spans, "span_count": len(spans)}
 
 
 async def check_health() -> bool:
@@ -18,7 +18,10 @@ on rx.Var objects at runtime. All such operations must be pre-computed in state
 as computed vars (decorated with @rx.var).
 """
 
+import time
+
 import reflex as rx
+from collections import deque, namedtuple
 from datetime import datetime
 from typing import Any, Dict, List, Optional
 
@@ -31,24 +34,52 @@ from . import api
 
 # Visual styling configuration for different span types.
 #
-# Each span type maps to a dict containing:
+# Each span type maps to a Style tuple containing:
 #     - color: Border and accent color (hex)
 #     - icon: Lucide icon name for the span type
 #     - bg: Background color (hex)
-SPAN_STYLES: Dict[str, Dict[str, str]] = {
-    "llm": {"color": "#3B82F6", "icon": "bot", "bg": "#EFF6FF"},
-    "agent": {"color": "#8B5CF6", "icon": "user-secret", "bg": "#F5F3FF"},
-    "tool": {"color": "#10B981", "icon": "wrench", "bg": "#ECFDF5"},
-    "function": {"color": "#F59E0B", "icon": "function-square", "bg": "#FFFBEB"},
-    "retrieval": {"color": "#06B6D4", "icon": "search", "bg": "#ECFEFF"},
-    "embedding": {"color": "#EC4899", "icon": "bar-chart", "bg": "#FDF2F8"},
-    "chain": {"color": "#EAB308", "icon": "link", "bg": "#FEFCE8"},
-    "other": {"color": "#6B7280", "icon": "circle", "bg": "#F9FAFB"},
+#
+# Styles are read three times per span in the render loop, so attribute
+# access on a namedtuple (C-level index) beats three dict hash lookups.
+Style = namedtuple("Style", "color icon bg")
+
+SPAN_STYLES: Dict[str, Style] = {
+    "llm": Style(color="#3B82F6", icon="bot", bg="#EFF6FF"),
+    "agent": Style(color="#8B5CF6", icon="user-secret", bg="#F5F3FF"),
+    "tool": Style(color="#10B981", icon="wrench", bg="#ECFDF5"),
+    "function": Style(color="#F59E0B", icon="function-square", bg="#FFFBEB"),
+    "retrieval": Style(color="#06B6D4", icon="search", bg="#ECFEFF"),
+    "embedding": Style(color="#EC4899", icon="bar-chart", bg="#FDF2F8"),
+    "chain": Style(color="#EAB308", icon="link", bg="#FEFCE8"),
+    "other": Style(color="#6B7280", icon="circle", bg="#F9FAFB"),
 }
 
 # Default placeholder for missing values
 PLACEHOLDER = "—"
 
+# Minimum seconds between real health-check RPCs. Every dashboard mount
+# (and every open tab) used to fire its own /health request; the cache
+# below is shared process-wide so at most one RPC goes out per interval.
+HEALTH_CHECK_INTERVAL = 10.0
+
+_health_cache: Dict[str, Any] = {"healthy": True, "checked_at": 0.0}
+
+
+async def _cached_health() -> bool:
+    """Return API health, re-checking at most once per interval.
+
+    Returns
+    -------
+    bool
+        Last known health status; refreshed via api.check_health() when
+        the cached value is older than HEALTH_CHECK_INTERVAL seconds.
+    """
+    now = time.monotonic()
+    if now - _health_cache["checked_at"] >= HEALTH_CHECK_INTERVAL:
+        _health_cache["healthy"] = await api.check_health()
+        _health_cache["checked_at"] = now
+    return _health_cache["healthy"]
+
 
 # =============================================================================
 # DASHBOARD STATE
@@ -213,8 +244,12 @@ class DashboardState(rx.State):
             await self.load_trace_detail(trace_id)
 
     async def check_health(self) -> None:
-        """Check if the tracer API is healthy and update state."""
-        self.healthy = await api.check_health()
+        """Check if the tracer API is healthy and update state.
+
+        Reads the shared health cache, so repeated mounts and multiple
+        open tabs don't multiply /health RPC traffic.
+        """
+        self.healthy = await _cached_health()
 
     async def refresh(self) -> None:
         """Refresh all dashboard data.
@@ -579,10 +614,10 @@ class DashboardState(rx.State):
                         f"calc({depth} * 1.5rem)" if depth > 0 else "0"
                     ),
                     # Styling
-                    "style_color": style["color"],
-                    "style_icon": style["icon"],
-                    "style_bg": style["bg"],
-                    "border_left_style": f"3px solid {style['color']}",
+                    "style_color": style.color,
+                    "style_icon": style.icon,
+                    "style_bg": style.bg,
+                    "border_left_style": f"3px solid {style.color}",
                     # Formatted values
                     "duration_formatted": self._format_duration(
                         span.get("duration_ms")
@@ -755,7 +790,7 @@ class DashboardState(rx.State):
                 "left_pct_str": f"{left_pct}%",
                 "width_pct_str": f"{width_pct}%",
                 # Styling
-                "style_color": style["color"],
+                "style_color": style.color,
                 # Display values
                 "name_truncated": name_truncated,
                 "duration_display": duration_display,
@@ -991,26 +1026,89 @@ class DashboardState(rx.State):
         Returns
         -------
         List[Dict[str, Any]]
-            List of root spans, each with a "children" list containing
-            nested child spans.
+            List of root spans. A span's "children" list is only present
+            once it actually has children; leaf spans carry no "children"
+            key at all, so consumers must read it via ``.get("children")``.
+
+        Notes
+        -----
+        Most spans in real traces are leaves, so eagerly allocating an
+        empty children list per node wasted a list allocation for the
+        majority of spans. Lists are now allocated lazily on the first
+        child append.
+
+        Parent links from a buggy (or malicious) producer can form cycles
+        (e.g. A.parent=B, B.parent=A). Such spans are unreachable from any
+        root and would leave circular "children" lists that make renderers
+        loop forever. A single O(n) pass after linking detects them and
+        breaks one parent link per cycle, promoting that span to a root.
         """
         if not spans:
             return []
 
-        # Create lookup map with children lists
+        # Create lookup map; children lists are allocated lazily on first
+        # append so leaf spans never pay for an empty list
         span_map: Dict[str, Dict[str, Any]] = {
-            s["span_id"]: {**s, "children": []} for s in spans
+            s["span_id"]: {**s} for s in spans
         }
         roots: List[Dict[str, Any]] = []
 
-        # Build tree by linking children to parents
+        # Build tree by linking children to parents. The dict view and
+        # bound-method locals keep the per-span cost of the loop down on
+        # large traces.
+        known_ids = span_map.keys()
+        roots_append = roots.append
+
         for span in spans:
             span_id = span["span_id"]
             parent_id = span.get("parent_span_id")
 
-            if parent_id and parent_id in span_map:
-                span_map[parent_id]["children"].append(span_map[span_id])
+            if parent_id and parent_id in known_ids:
+                parent = span_map[parent_id]
+                children = parent.get("children")
+                if children is None:
+                    parent["children"] = [span_map[span_id]]
+                else:
+                    children.append(span_map[span_id])
             else:
-                roots.append(span_map[span_id])
+                roots_append(span_map[span_id])
+
+        # Cycle check: mark everything reachable from the roots (each span
+        # has at most one parent, so this is a simple forest walk).
+        visited: set = set()
+        stack = deque(roots)
+        while stack:
+            node = stack.pop()
+            if node["span_id"] in visited:
+                continue
+            visited.add(node["span_id"])
+            stack.extend(node.get("children", ()))
+
+        # Anything left unvisited hangs off a parent cycle. Walk its parent
+        # chain (GREY marking) to find a span inside the cycle, clear that
+        # span's parent link, promote it to a root, and mark its subtree.
+        for span_id in span_map:
+            if span_id in visited:
+                continue
+
+            grey: set = set()
+            current = span_map[span_id]
+            while current["span_id"] not in grey:
+                grey.add(current["span_id"])
+                current = span_map[current["parent_span_id"]]
+
+            # current is inside the cycle: break its parent link
+            parent = span_map[current["parent_span_id"]]
+            parent["children"].remove(current)
+            current["parent_span_id"] = None
+            roots.append(current)
+
+            stack = deque([current])
+            while stack:
+                node = stack.pop()
+                if node["span_id"] in visited:
+                    continue
+                visited.add(node["span_id"])
+                stack.extend(node.get("children", ()))
 
         return roots
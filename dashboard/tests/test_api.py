@@ -122,6 +122,29 @@ class TestGetTraceDetail:
 
         assert route.called
 
+    @pytest.mark.asyncio
+    async def test_parses_ndjson_stream(self, respx_mock):
+        """Should fold an NDJSON stream back into trace + spans."""
+        trace_id = "abc-123"
+        body = (
+            b'{"trace": {"trace_id": "abc-123"}}\n'
+            b'{"span_id": "s1"}\n'
+            b'{"span_id": "s2"}\n'
+        )
+        respx_mock.get(f"{API_URL}/api/traces/{trace_id}").mock(
+            return_value=httpx.Response(
+                200,
+                content=body,
+                headers={"content-type": "application/x-ndjson"},
+            )
+        )
+
+        result = await get_trace_detail(trace_id)
+
+        assert result["trace"]["trace_id"] == trace_id
+        assert [s["span_id"] for s in result["spans"]] == ["s1", "s2"]
+        assert result["span_count"] == 2
+
     @pytest.mark.asyncio
     async def test_raises_on_not_found(self, respx_mock):
         """Should raise on 404 (trace not found)."""
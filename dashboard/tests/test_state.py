@@ -224,17 +224,60 @@ class TestBuildSpanTree:
         tree = state._build_span_tree(state, [])
         assert len(tree) == 0
 
+    def test_breaks_parent_cycles(self, state):
+        """Spans forming a parent cycle are promoted to roots, not lost."""
+        spans = [
+            {"span_id": "a", "parent_span_id": "b"},
+            {"span_id": "b", "parent_span_id": "a"},
+        ]
+
+        tree = state._build_span_tree(state, spans)
+
+        # One span had its parent link broken and became a root;
+        # the other stays nested under it.
+        assert len(tree) == 1
+        root = tree[0]
+        assert root["parent_span_id"] is None
+        assert len(root["children"]) == 1
+        assert root["children"][0]["children"] == [], (
+            "cycle must be broken so children lists terminate"
+        )
+
+
+class TestHealthCache:
+    """Tests for the shared health-check cache."""
+
+    @pytest.mark.asyncio
+    async def test_health_rpc_cached_within_interval(self, monkeypatch):
+        """Repeated checks inside the interval fire a single RPC."""
+        from dashboard import state as state_mod
+
+        calls = []
+
+        async def fake_check_health():
+            calls.append(1)
+            return True
+
+        monkeypatch.setattr(state_mod.api, "check_health", fake_check_health)
+        monkeypatch.setitem(state_mod._health_cache, "checked_at", 0.0)
+
+        assert await state_mod._cached_health() is True
+        assert await state_mod._cached_health() is True
+
+        assert len(calls) == 1, "second check should hit the cache"
+
 
 class TestSpanStyles:
     """Tests for SPAN_STYLES configuration."""
 
     def test_all_span_types_have_required_keys(self):
         """Each span type must have color, icon, and bg."""
-        required_keys = {"color", "icon", "bg"}
-        
+        required_fields = {"color", "icon", "bg"}
+
         for span_type, style in SPAN_STYLES.items():
-            assert required_keys.issubset(style.keys()), (
-                f"Span type '{span_type}' is missing keys: {required_keys - style.keys()}"
+            assert required_fields.issubset(style._fields), (
+                f"Span type '{span_type}' is missing fields: "
+                f"{required_fields - set(style._fields)}"
             )
         
     def test_has_fallback_type(self):
@@ -5,4 +5,21 @@ from src.server import app
 
 # Wrap fastAPI app for lambda
 # lifespan="off" prevents startup/shutdown events from blocking
-handler = Mangum(app, lifespan="off")
+# Passing api_gateway_base_path / custom_handlers / text_mime_types
+# explicitly skips Mangum's per-invoke defaults resolution. The list
+# REPLACES Mangum's defaults, so it must name every text content type
+# the app emits: JSON, HTML for the dashboard page, and NDJSON from the
+# streaming trace-detail response — anything missing here gets
+# base64-encoded (~33% larger) on the way out.
+handler = Mangum(
+    app,
+    lifespan="off",
+    api_gateway_base_path="/",
+    custom_handlers=[],
+    text_mime_types=[
+        "application/json",
+        "application/x-ndjson",
+        "text/plain",
+        "text/html",
+    ],
+)
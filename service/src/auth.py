@@ -1,35 +1,73 @@
 """API key authentication middleware"""
 
 import os
+from functools import lru_cache
+from typing import Optional
 from fastapi import Security, HTTPException, status
 from fastapi.security import APIKeyHeader
 
 api_key_header = APIKeyHeader(name="X-API-Key", auto_error=False)
 
+# Auth config is read once at import time instead of per request.
+# get_api_key runs on every API call, and repeated os.getenv lookups plus
+# re-splitting API_KEYS dominated the auth path. A frozenset makes the
+# key check a single O(1) membership test.
+_AUTH_REQUIRED: bool = False
+_DEFAULT_KEY: str = "project-public"
+_VALID_KEYS: frozenset = frozenset()
+
+
+def reload_auth_config() -> None:
+    """Reload auth configuration from environment variables.
+
+    Called once at import time; tests that mutate API_KEY_REQUIRED,
+    DEFAULT_PROJECT_KEY or API_KEYS can call this to pick up the change.
+    """
+    global _AUTH_REQUIRED, _DEFAULT_KEY, _VALID_KEYS
+    _AUTH_REQUIRED = os.getenv("API_KEY_REQUIRED", "false").lower() == "true"
+    _DEFAULT_KEY = os.getenv("DEFAULT_PROJECT_KEY", "project-public")
+    _VALID_KEYS = frozenset(k for k in os.getenv("API_KEYS", "").split(",") if k)
+
+
+reload_auth_config()
+
 
 def get_api_key(api_key: str = Security(api_key_header)) -> str:
     """Validate API key from request header."""
-    if not os.getenv("API_KEY_REQUIRED", "false").lower() == "true":
+    if not _AUTH_REQUIRED:
         # Return default project key when auth is disabled
-        return os.getenv("DEFAULT_PROJECT_KEY", "project-public")
+        return _DEFAULT_KEY
 
-    valid_keys = os.getenv("API_KEYS", "").split(",")
-
-    if not api_key or api_key not in valid_keys:
+    if api_key not in _VALID_KEYS:
         raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED, 
+            status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid or missing API key"
         )
-    
+
     return api_key
 
 
-def extract_project_id(api_key: str) -> str:
-    """Extract project ID from API key of format: project-{project_id}"""
+@lru_cache(maxsize=256)
+def _extract(api_key: str) -> Optional[str]:
+    """Parse project ID out of an API key, or None if the format is invalid.
+
+    The set of API keys in use is tiny and fixed, so the string ops run at
+    most once per distinct key; every later call is a cache hit. Kept
+    separate from extract_project_id because lru_cache would otherwise
+    re-raise a cached HTTPException instance across requests.
+    """
     if api_key.startswith("project-"):
         project_id = api_key.replace("project-", "", 1)
         if project_id:  # Ensure not empty after extraction
             return project_id
+    return None
+
+
+def extract_project_id(api_key: str) -> str:
+    """Extract project ID from API key of format: project-{project_id}"""
+    project_id = _extract(api_key)
+    if project_id is not None:
+        return project_id
 
     # No side-effect is planned for this method, so we raise an exception
     raise HTTPException(
@@ -2,19 +2,97 @@
 
 from datetime import datetime
 from decimal import Decimal
-from typing import List, Optional, Dict, Any, Union
-from pydantic import BaseModel, Field, field_validator, ConfigDict
-import json
+from typing import List, Optional, Dict, Any, Union, Literal
+from pydantic import BaseModel, Field, field_validator, model_validator, ConfigDict
+import heapq
+import orjson
 import logging
+import string
+from functools import lru_cache
 
 logger = logging.getLogger(__name__)
 
+
+def _fast_default(value: Any) -> Any:
+    """Fallback for the few types orjson has no native serializer for.
+
+    orjson handles datetime and UUID in C without ever invoking this
+    callback; in practice only Decimal (from DynamoDB reads) and exotic
+    client types land here. Decimal goes out as float, which is cheaper
+    than str and round-trips as a JSON number.
+    """
+    if isinstance(value, Decimal):
+        return float(value)
+    return str(value)
+
+
+def _dumps(data: Any) -> bytes:
+    """Serialize data to JSON bytes for size measurement.
+
+    truncate_dict and friends only serialize to measure how many bytes a
+    payload would occupy in DynamoDB. orjson is several times faster than
+    stdlib json here and returns bytes, so len() counts actual bytes
+    instead of characters (stdlib len(str) under-counts multi-byte UTF-8).
+    OPT_NON_STR_KEYS matches stdlib's tolerance of non-string dict keys.
+    orjson is a declared dependency, so there is deliberately no stdlib
+    json fallback path here.
+    """
+    return orjson.dumps(data, default=_fast_default, option=orjson.OPT_NON_STR_KEYS)
+
 # DynamoDB item sioze limit is 400KB, we use conservative limits
 MAX_METADATA_SIZE = 10_000  # 10 KB
 MAX_INPUT_OUTPUT_SIZE = 50_000  # 50 KB
 MAX_STRING_LENGTH = 10_000  # 10 KB for output/ error strings
 MAX_ITEM_SIZE = 350_000  # 350 KB for safety margin for full_item
 
+# Truncation-marker templates, precomputed once. %-formatting beats
+# building a fresh f-string per truncated value in the hot loops below.
+_TRUNC_SUFFIX = "... [truncated, was %d chars]"
+_TRUNC_SUFFIX_NL = "\n... [truncated, was %d chars]"
+
+
+@lru_cache(maxsize=1024)
+def _to_decimal(value: float) -> Decimal:
+    """Convert a float to Decimal for DynamoDB, memoized.
+
+    str(float) plus Decimal parsing is surprisingly expensive, and cost
+    values repeat heavily across spans (per-model pricing), so the cache
+    hits most of the time in steady state.
+
+    Deliberately NOT boto3's DYNAMODB_CONTEXT.create_decimal_from_float:
+    that expands the float's exact binary value to 38 significant digits
+    (0.0025 becomes 0.002500000000000000052...), polluting stored costs,
+    whereas str() gives the shortest round-trip representation.
+    """
+    return Decimal(str(value))
+
+
+def _parse_datetime(v):
+    """Parse a datetime from string if needed; shared by Trace and Span.
+
+    Module-level so both models register the same function instead of
+    carrying a classmethod copy each.
+    """
+    if v is None:
+        return v
+    if isinstance(v, str):
+        # fromisoformat accepts the trailing "Z" UTC shorthand natively
+        # since Python 3.11 (we require >=3.12), so no string surgery.
+        try:
+            v = datetime.fromisoformat(v)
+        except ValueError:
+            # Instead of raising error, we keep it as-is, to avoid
+            # crashing main application.
+            return v
+    # Enforce tz-awareness here, once, so the storage layer can trust
+    # model datetimes as-is instead of re-checking on every write.
+    if isinstance(v, datetime) and v.tzinfo is None:
+        raise ValueError(
+            "datetime must be timezone-aware. "
+            "Use datetime.now(timezone.utc) instead of datetime.now()."
+        )
+    return v
+
 
 def truncate_dict(
     data: Dict,
@@ -40,76 +118,259 @@ def truncate_dict(
     # if empty or none, just return the same back
     if not data:
         return data
-    
-    serialized = json.dumps(data, default=str)
+
+    # Already carries our truncation marker: this dict has likely been
+    # through here before (e.g. round-tripped via a complete/update
+    # flow). The marker travels in-band though, so a client can forge it
+    # on an arbitrarily large payload — honor it only after re-verifying
+    # the size (one cheap estimate or serialize, no re-truncation).
+    # Oversized payloads fall through to the normal pipeline below.
+    if "_truncated" in data:
+        if _estimated_fits(data, max_size) or len(_dumps(data)) <= max_size:
+            return data
+        logger.warning(
+            f"Ignoring _truncated marker on oversized {field_name} payload"
+        )
+
+    # Fast path: most payloads are small, flat dicts that obviously fit.
+    # A cheap character-count estimate lets those skip serialization
+    # entirely; anything with nested containers or near the limit falls
+    # through to the exact serialize-and-measure below.
+    if _estimated_fits(data, max_size):
+        return data
+
+    # Early abort: when string content alone already proves the payload
+    # oversized (multi-MB LLM outputs), serializing all of it just to
+    # learn that wastes a full orjson pass. Truncate the strings first
+    # and only fall back to the exact pipeline if that wasn't enough.
+    if _estimated_oversized(data, max_size):
+        logger.warning(
+            f"Truncating {field_name} to fit within size limit of {max_size} bytes"
+        )
+        truncated = _truncate_string_values(data, max_size)
+        if len(_dumps(truncated)) <= max_size:
+            truncated["_truncated"] = True
+            return truncated
+        # Rare: still too big after string truncation; fall through to
+        # the exact measure-and-drop path below.
+
+    serialized = _dumps(data)
     # Strategy 1: Try to serialize as-is
     if len(serialized) <= max_size:
         return data
-    
+
     logger.warning(
         f"Truncating {field_name} to fit within size limit of {max_size} bytes"
     )
 
+    # Clients repeat identical metadata (service tags, model names)
+    # across many spans, so oversized payloads are truncated once per
+    # serialized form and served from a keyed cache thereafter. The
+    # top-level copy keeps callers from mutating the cached entry.
+    return _truncate_oversized(serialized, max_size).copy()
+
+
+@lru_cache(maxsize=256)
+def _truncate_oversized(serialized: bytes, max_size: int) -> Dict:
+    """Apply truncation strategies 2 and 3, keyed by serialized payload.
+
+    Takes the orjson bytes (hashable, already computed by truncate_dict)
+    as the cache key and re-parses them, so repeated identical payloads
+    pay one parse instead of the full truncate-and-remeasure pipeline.
+    """
+    data = orjson.loads(serialized)
+
+    # data is freshly parsed and owned by this frame, so both strategies
+    # may mutate it in place (copy=False) instead of re-copying containers.
     # Strategy 2: Truncate string values
-    truncated = _truncate_string_values(data.copy(), max_size)
-    if len(json.dumps(truncated, default=str)) <= max_size:
+    truncated = _truncate_string_values(data, max_size, copy=False)
+    size_after = len(_dumps(truncated))
+    if size_after <= max_size:
         truncated["_truncated"] = True
         return truncated
-    
-    # Strategy 3: Remove largest keys until it fits
-    truncated = _drop_large_keys(data.copy(), max_size)
+
+    # Strategy 3: Remove largest keys until it fits (continues from the
+    # string-truncated payload, whose size we just measured)
+    truncated = _drop_large_keys(truncated, max_size, total=size_after, copy=False)
     truncated["_truncated"] = True
     truncated["_original_size"] = len(serialized)
     return truncated
 
 
+def _estimated_fits(data: Dict, max_size: int) -> bool:
+    """Cheaply decide whether a flat dict is guaranteed to fit max_size.
+
+    Counts characters of keys and scalar values; bails out (returns False)
+    on any nested container so only trivially-flat dicts take the fast
+    path. The 6x safety factor covers the worst case a character can
+    expand to in serialized JSON (a \\uXXXX escape is 6 bytes), so a True
+    here can never let an oversized payload through.
+    """
+    approx = 2  # enclosing braces
+    for key, value in data.items():
+        if isinstance(value, str):
+            approx += len(str(key)) + len(value) + 6  # quotes, colon, comma
+        elif value is None or isinstance(value, (int, float, bool)):
+            approx += len(str(key)) + 32
+        else:
+            return False  # nested container: needs the exact measurement
+    return approx * 6 <= max_size
+
+
+def _estimated_oversized(data: Dict, max_size: int) -> bool:
+    """Cheap lower bound: True only if data certainly exceeds max_size.
+
+    Sums the lengths of top-level string values — a string serializes to
+    at least len(s) bytes in UTF-8 — and exits as soon as the running
+    total passes the limit, so a True can never misclassify a payload
+    that would actually fit. Counterpart to _estimated_fits.
+    """
+    approx = 0
+    for value in data.values():
+        if isinstance(value, str):
+            approx += len(value) + 3  # quotes, colon
+            if approx > max_size:
+                return True
+    return False
+
+
 def _truncate_string_values(
     data: Dict,
     max_size: int,
-    max_str_len: int = 1000
+    max_str_len: int = 1000,
+    copy: bool = True,
 ) -> Dict:
-    """Recursively truncate string values in a dictionary."""
-    result = {}
-    for key, value in data.items():
-        if isinstance(value, str) and len(value) > max_str_len:
-            result[key] = value[:max_str_len] + f"... [truncated, was {len(value)} chars]"
-        elif isinstance(value, dict):
-            result[key] = _truncate_string_values(value, max_size, max_str_len)
-        elif isinstance(value, list):
-            result[key] = [
-                _truncate_string_values(v, max_size, max_str_len) if isinstance(v, dict)
-                else (
-                    v[:max_str_len] + "..." if isinstance(v, str) and len(v) > max_str_len
-                    else v
-                )
-                for v in value
-            ]
-        else:
-            result[key] = value
+    """Truncate string values in a (possibly nested) dictionary.
+
+    Walks the structure with an explicit work stack instead of recursion.
+    With copy=True (default) each container is shallow-copied exactly
+    once before mutation so the input is left untouched; callers that
+    own `data` outright pass copy=False to mutate it in place and skip
+    the container copies entirely.
+    """
+    # Copy-on-write: if no string anywhere exceeds the limit the walk
+    # below would rebuild the whole structure just to change nothing,
+    # so a cheap read-only scan decides first whether to allocate at all.
+    if not _needs_string_truncation(data, max_str_len):
+        return data
+
+    result = data.copy() if copy else data
+    stack = [result]  # dicts pending a truncation pass
+
+    while stack:
+        current = stack.pop()
+        for key, value in current.items():
+            if isinstance(value, str):
+                if len(value) > max_str_len:
+                    current[key] = value[:max_str_len] + _TRUNC_SUFFIX % len(value)
+            elif isinstance(value, dict):
+                # Branch pruning: if the whole subtree serializes to
+                # fewer bytes than max_str_len, no string inside it can
+                # exceed the limit — keep the original reference.
+                if len(_dumps(value)) <= max_str_len:
+                    continue
+                if copy:
+                    value = value.copy()
+                    current[key] = value
+                stack.append(value)
+            elif isinstance(value, list):
+                if len(_dumps(value)) <= max_str_len:
+                    continue
+                new_list = value if not copy else []
+                for i, item in enumerate(value):
+                    if isinstance(item, dict):
+                        if copy:
+                            item = item.copy()
+                        stack.append(item)
+                    elif isinstance(item, str) and len(item) > max_str_len:
+                        item = item[:max_str_len] + "..."
+                    if copy:
+                        new_list.append(item)
+                    else:
+                        new_list[i] = item
+                current[key] = new_list
+
     return result
 
 
-def _drop_large_keys(data: Dict, max_size: int) -> Dict:
-    """Remove largest keys by VALUE size until dict fits within max_size."""
-    result = data.copy()
-    dropped_keys = set()
+def _needs_string_truncation(data: Dict, max_str_len: int) -> bool:
+    """Scan for any string exceeding max_str_len, without allocating.
+
+    Mirrors the traversal of _truncate_string_values exactly (dicts,
+    and dicts or strings directly inside list values) so a False here
+    guarantees the truncation walk would be a no-op.
+    """
+    stack = [data]
+    while stack:
+        current = stack.pop()
+        for value in current.values():
+            if isinstance(value, str):
+                if len(value) > max_str_len:
+                    return True
+            elif isinstance(value, dict):
+                stack.append(value)
+            elif isinstance(value, list):
+                for item in value:
+                    if isinstance(item, dict):
+                        stack.append(item)
+                    elif isinstance(item, str) and len(item) > max_str_len:
+                        return True
+    return False
+
+
+def _approx_value_size(value: Any) -> int:
+    """Approximate serialized byte size of a value, for drop ranking.
+
+    LLM spans often carry large homogeneous lists (token logprob arrays,
+    tag lists) whose size is estimable arithmetically; serializing them
+    just to rank them is the hot spot of _drop_large_keys. Ranking only
+    needs relative order, so the ~12-byte JSON number width is fine.
+    Mixed and nested structures fall back to exact measurement.
+    """
+    if isinstance(value, str):
+        return len(value) + 2
+    if isinstance(value, list) and value:
+        if all(type(v) in (int, float) for v in value):
+            return 12 * len(value) + 2
+        if all(type(v) is str for v in value):
+            return sum(map(len, value)) + 4 * len(value) + 2
+    return len(_dumps(value))
+
 
-    while len(json.dumps(result, default=str)) > max_size and result:
-        # Find key with largest VALUE that hasn't been dropped yet
-        droppable_keys = [k for k in result.keys() if k not in dropped_keys]
-        # All keys already dropped, but if we can't shrink further, just break
-        if not droppable_keys:
-            # Normally, dynamodb has gracious limits set, but someone can create a test case
-            # to hit this limit and if not forced to break - goes to infinite loop.
-            break
+def _drop_large_keys(
+    data: Dict,
+    max_size: int,
+    total: Optional[int] = None,
+    copy: bool = True,
+) -> Dict:
+    """Remove largest keys by VALUE size until dict fits within max_size.
+
+    Values are ranked with a cheap size estimate; a max-heap then yields
+    keys largest-first while a running byte total tracks the effect of
+    each drop. Only values actually dropped are serialized (to report an
+    exact byte count), so surviving keys never pay for serialization.
+    Callers that already measured the payload pass `total` to skip the
+    initial full serialization here.
+    """
+    if total is None:
+        total = len(_dumps(data))
+    if total <= max_size:
+        return data
 
-        largest_key = max(
-            droppable_keys,
-            key=lambda k: len(json.dumps(result[k], default=str))
-        )
-        dropped_size = len(json.dumps(result[largest_key], default=str))
-        result[largest_key] = f"[dropped: {dropped_size} bytes]"
-        dropped_keys.add(largest_key)
+    result = data.copy() if copy else data
+
+    # Max-heap of (negative approximate size, key)
+    heap = [(-_approx_value_size(v), k) for k, v in result.items()]
+    heapq.heapify(heap)
+
+    # Once the heap is empty every key has been dropped; if the placeholders
+    # alone still exceed max_size we stop anyway to avoid an infinite loop.
+    while total > max_size and heap:
+        _, key = heapq.heappop(heap)
+        dropped_size = len(_dumps(result[key]))
+        placeholder = f"[dropped: {dropped_size} bytes]"
+        result[key] = placeholder
+        total -= dropped_size - len(_dumps(placeholder))
 
     return result
         
@@ -126,7 +387,7 @@ def truncate_string(
         return value
 
     logger.warning(f"Truncating {field_name}: {len(value)} chars -> {max_length} chars")
-    return value[:max_length - 50] + f"\n... [truncated, was {len(value)} chars]"
+    return value[:max_length - 50] + _TRUNC_SUFFIX_NL % len(value)
 
 
 def stringify_metadata(data: Optional[Dict]) -> Optional[Dict]:
@@ -134,22 +395,43 @@ def stringify_metadata(data: Optional[Dict]) -> Optional[Dict]:
 
     DynamoDB does not support Python floats and other base types.
     We convert all values to strings to ensure compatibility.
+    type(v) is str (rather than isinstance) skips the conversion for
+    values that are already plain strings — the common case when
+    clients stringify metadata themselves.
     """
     if not data:
         return data
-    return {k: str(v) for k, v in data.items()}
+    return {k: v if type(v) is str else str(v) for k, v in data.items()}
+
+
+# Validation lookups, built once. Set-based checks beat the regex
+# patterns pydantic would otherwise run on every request.
+SpanType = Literal[
+    "llm", "tool", "agent", "function", "retrieval", "embedding", "chain", "other"
+]
+_PROJECT_ID_CHARS = frozenset(string.ascii_letters + string.digits + "_-")
 
 
 class TraceCreate(BaseModel):
     """Request model for creating a trace"""
 
     name: str = Field(..., min_length=1, max_length=255)
-    project_id: str = Field(..., min_length=1, max_length=100, pattern=r'^[a-zA-Z0-9_-]+$')
+    project_id: str = Field(..., min_length=1, max_length=100)
     metadata: Optional[Dict[str, Any]] = Field(default_factory=dict)
     tags: Optional[List[str]] = Field(default_factory=list, max_items=50)
     user_id: Optional[str] = Field(None, max_length=255)
     session_id: Optional[str] = Field(None, max_length=255)
 
+    @field_validator("project_id")
+    @classmethod
+    def validate_project_id(cls, v: str) -> str:
+        """Restrict project_id to [a-zA-Z0-9_-], set-based."""
+        if not _PROJECT_ID_CHARS.issuperset(v):
+            raise ValueError(
+                "project_id may only contain letters, digits, '_' and '-'"
+            )
+        return v
+
     @field_validator("tags")
     @classmethod
     def validate_tags(cls, v: Optional[List[str]]) -> List[str]:
@@ -158,19 +440,27 @@ class TraceCreate(BaseModel):
             return [tag[:100] for tag in v if tag.strip()]  # Limit tag length
         return []
     
-    @field_validator("metadata")
-    @classmethod
-    def truncate_metadata(cls, v: Optional[Dict]) -> Optional[Dict]:
-        """Stringify and truncate metadata for DynamoDB compatibility."""
-        if not v:
-            return v
-        v = stringify_metadata(v)
-        return truncate_dict(v, MAX_METADATA_SIZE, "trace.metadata")
+    @model_validator(mode="after")
+    def truncate_payload_fields(self) -> "TraceCreate":
+        """Stringify and truncate metadata for DynamoDB compatibility.
+
+        A single after-validator instead of per-field validators keeps
+        pydantic -> Python dispatch to one call per instantiation.
+        """
+        if self.metadata:
+            self.metadata = truncate_dict(
+                stringify_metadata(self.metadata), MAX_METADATA_SIZE, "trace.metadata"
+            )
+        return self
 
 
 class Trace(BaseModel):
     """Complete trace object - DynamoDB Compatible"""
 
+    # Note: frozen=True would look attractive here but the truncation
+    # after-validator mutates fields in place, and read endpoints return
+    # raw storage dicts rather than rebuilding models, so instance-count
+    # concerns don't apply on the read path.
     model_config = ConfigDict(
         populate_by_name=True,  # For accepting aliases defined in Field; you can define camelCase as alias for snake_case
         json_encoders={datetime: lambda v: v.isoformat()},  # Tells pydantic how to encode datetime objects when dumping to JSON
@@ -191,65 +481,86 @@ class Trace(BaseModel):
     span_count: int = 0
     total_cost: Optional[float] = None
 
-    @field_validator("start_time", "end_time", mode="before")
-    @classmethod
-    def parse_datetime(cls, v):
-        """Parse datetime from string if needed."""
-        if v is None:
-            return v
-        if isinstance(v, datetime):
-            return v
-        if isinstance(v, str):
-            try:
-                # input like: "2025-12-13T01:04:27Z" -> "2025-12-13T01:04:27+00:00"
-                # trailing Z is shorthand for UTC, that datetime does not understand.
-                return datetime.fromisoformat(v.replace("Z", "+00:00"))
-            except ValueError:
-                # Instead of raising error, we keep it as-is, to avoid crashing main
-                # application.
-                return v
-        return v
-    
-    @field_validator("output")
-    @classmethod
-    def truncate_output(cls, v: Optional[str]) -> Optional[str]:
-        """Truncate output to fit DynamoDB item size limit
-        
-        Note: Purpose of trace is NOT to store outputs of LLM, rather its performance metrics.
-        Hence, we truncate to max size of 1000 characters.
+    parse_datetime = field_validator("start_time", "end_time", mode="before")(
+        _parse_datetime
+    )
+
+
+    @model_validator(mode="after")
+    def truncate_payload_fields(self) -> "Trace":
+        """Truncate output and metadata to fit DynamoDB item size limits.
+
+        Note: Purpose of trace is NOT to store outputs of LLM, rather its
+        performance metrics - hence the aggressive output truncation. One
+        after-validator replaces the per-field validators so pydantic only
+        dispatches into Python once per instantiation.
         """
-        if not v:
-            return v
-        return truncate_string(v, MAX_STRING_LENGTH, "trace.output")
-    
-    @field_validator("metadata")
+        if self.output:
+            self.output = truncate_string(self.output, MAX_STRING_LENGTH, "trace.output")
+        if self.metadata:
+            self.metadata = truncate_dict(
+                stringify_metadata(self.metadata), MAX_METADATA_SIZE, "trace.metadata"
+            )
+        return self
+
     @classmethod
-    def truncate_metadata(cls, v: Optional[Dict]) -> Optional[Dict]:
-        """Stringify and truncate metadata for DynamoDB compatibility."""
-        if not v:
-            return v
-        v = stringify_metadata(v)
-        return truncate_dict(v, MAX_METADATA_SIZE, "trace.metadata")
+    def from_trusted(
+        cls,
+        trace: "TraceCreate",
+        trace_id: str,
+        project_id: str,
+        start_time: datetime,
+    ) -> "Trace":
+        """Build a Trace from an already-validated TraceCreate.
+
+        Uses model_construct: every payload field went through
+        TraceCreate's validators (including the truncation pass), so
+        re-validating here would serialize and truncate a second time.
+        """
+        return cls.model_construct(
+            trace_id=trace_id,
+            name=trace.name,
+            project_id=project_id,
+            start_time=start_time,
+            tags=trace.tags or [],
+            metadata=trace.metadata,
+            user_id=trace.user_id,
+            session_id=trace.session_id,
+        )
 
     def to_dynamodb_item(self) -> Dict[str, Any]:
-        """Convert to DynamoDB compatible Dictionary."""
-        item = self.model_dump(exclude_none=True)
-        if isinstance(item.get("start_time"), datetime):
-            item["start_time"] = item["start_time"].isoformat()
-        if isinstance(item.get("end_time"), datetime):
-            item["end_time"] = item["end_time"].isoformat()
+        """Convert to DynamoDB compatible Dictionary.
+
+        Builds the dict directly from the model fields instead of
+        model_dump, which routes through pydantic's generic serializer
+        and deep-copies nested containers on every call. The datetime
+        and Decimal conversions happen inline in the same pass.
+        """
+        item: Dict[str, Any] = {}
+        for key in _TRACE_FIELDS:
+            value = getattr(self, key)
+            if value is None:
+                continue
+            if isinstance(value, datetime):
+                value = value.isoformat()
+            item[key] = value
         # Convert total_cost float to Decimal for DynamoDB
-        if item.get("total_cost") is not None:
-            item["total_cost"] = Decimal(str(item["total_cost"]))
+        if "total_cost" in item:
+            item["total_cost"] = _to_decimal(item["total_cost"])
 
         return item
 
 
+# Field names resolved once at import; to_dynamodb_item iterates this
+# tuple instead of asking pydantic for the field set per call.
+_TRACE_FIELDS = tuple(Trace.model_fields)
+
+
 class SpanCreate(BaseModel):
     """Request model for creating a span - auto-truncates large data."""
     
     name: str = Field(..., min_length=1, max_length=255)
-    span_type: str = Field(..., pattern=r'^(llm|tool|agent|function|retrieval|embedding|chain|other)$')
+    span_type: SpanType
     parent_span_id: Optional[str] = Field(None, max_length=100)
     input_data: Optional[Dict[str, Any]] = Field(default_factory=dict)
     output_data: Optional[Dict[str, Any]] = Field(default_factory=dict)
@@ -260,30 +571,26 @@ class SpanCreate(BaseModel):
     cost_usd: Optional[float] = Field(None, ge=0)
     error: Optional[str] = None
 
-    @field_validator("input_data")
-    @classmethod
-    def truncate_input_data(cls, v: Optional[Dict]) -> Optional[Dict]:
-        """Truncate input data to fit DynamoDB item size limit"""
-        if not v:
-            return v
-        return truncate_dict(v, MAX_INPUT_OUTPUT_SIZE, "span.input_data")
-
-    @field_validator("output_data")
-    @classmethod
-    def truncate_output_data(cls, v: Optional[Dict]) -> Optional[Dict]:
-        """Truncate output data to fit DynamoDB item size limit"""
-        if not v:
-            return v
-        return truncate_dict(v, MAX_INPUT_OUTPUT_SIZE, "span.output_data")
+    @model_validator(mode="after")
+    def truncate_payload_fields(self) -> "SpanCreate":
+        """Truncate input/output data and metadata to fit DynamoDB limits.
 
-    @field_validator("metadata")
-    @classmethod
-    def truncate_metadata(cls, v: Optional[Dict]) -> Optional[Dict]:
-        """Stringify and truncate metadata for DynamoDB compatibility."""
-        if not v:
-            return v
-        v = stringify_metadata(v)
-        return truncate_dict(v, MAX_METADATA_SIZE, "span.metadata")
+        A single after-validator instead of three per-field validators
+        keeps pydantic -> Python dispatch to one call per instantiation.
+        """
+        if self.input_data:
+            self.input_data = truncate_dict(
+                self.input_data, MAX_INPUT_OUTPUT_SIZE, "span.input_data"
+            )
+        if self.output_data:
+            self.output_data = truncate_dict(
+                self.output_data, MAX_INPUT_OUTPUT_SIZE, "span.output_data"
+            )
+        if self.metadata:
+            self.metadata = truncate_dict(
+                stringify_metadata(self.metadata), MAX_METADATA_SIZE, "span.metadata"
+            )
+        return self
 
 
 class Span(BaseModel):
@@ -311,51 +618,66 @@ class Span(BaseModel):
     cost_usd: Optional[float] = None
     error: Optional[str] = None
     
-    @field_validator("start_time", "end_time", mode="before")
-    @classmethod
-    def parse_datetime(cls, v):
-        """Parse datetime from string if needed."""
-        if v is None:
-            return v
-        if isinstance(v, datetime):
-            return v
-        if isinstance(v, str):
-            try:
-                return datetime.fromisoformat(v.replace("Z", "+00:00"))
-            except ValueError:
-                return v
-        return v
-    
-    @field_validator("input_data")
-    @classmethod
-    def truncate_input_data(cls, v: Optional[Dict]) -> Optional[Dict]:
-        """Truncate input data to fit DynamoDB item size limit"""
-        if not v:
-            return v
-        return truncate_dict(v, MAX_INPUT_OUTPUT_SIZE, "span.input_data")
+    parse_datetime = field_validator("start_time", "end_time", mode="before")(
+        _parse_datetime
+    )
 
-    @field_validator("output_data")
-    @classmethod
-    def truncate_output_data(cls, v: Optional[Dict]) -> Optional[Dict]:
-        """Truncate output data to fit DynamoDB item size limit"""
-        if not v:
-            return v
-        return truncate_dict(v, MAX_INPUT_OUTPUT_SIZE, "span.output_data")
 
-    @field_validator("error")
-    @classmethod
-    def truncate_error(cls, v: Optional[str]) -> Optional[str]:
-        """Truncate error message"""
-        return truncate_string(v, MAX_STRING_LENGTH, "span.error")
+    @model_validator(mode="after")
+    def truncate_payload_fields(self) -> "Span":
+        """Truncate input/output data, error and metadata to DynamoDB limits.
+
+        A single after-validator instead of four per-field validators
+        keeps pydantic -> Python dispatch to one call per instantiation.
+        """
+        if self.input_data:
+            self.input_data = truncate_dict(
+                self.input_data, MAX_INPUT_OUTPUT_SIZE, "span.input_data"
+            )
+        if self.output_data:
+            self.output_data = truncate_dict(
+                self.output_data, MAX_INPUT_OUTPUT_SIZE, "span.output_data"
+            )
+        if self.error:
+            self.error = truncate_string(self.error, MAX_STRING_LENGTH, "span.error")
+        if self.metadata:
+            self.metadata = truncate_dict(
+                stringify_metadata(self.metadata), MAX_METADATA_SIZE, "span.metadata"
+            )
+        return self
 
-    @field_validator("metadata")
     @classmethod
-    def truncate_metadata(cls, v: Optional[Dict]) -> Optional[Dict]:
-        """Stringify and truncate metadata for DynamoDB compatibility."""
-        if not v:
-            return v
-        v = stringify_metadata(v)
-        return truncate_dict(v, MAX_METADATA_SIZE, "span.metadata")
+    def from_trusted(
+        cls,
+        span: "SpanCreate",
+        span_id: str,
+        trace_id: str,
+        start_time: datetime,
+    ) -> "Span":
+        """Build a Span from an already-validated SpanCreate.
+
+        Same reasoning as Trace.from_trusted: the request model already
+        ran the truncation validators, so model_construct skips the
+        duplicate pass.
+        """
+        return cls.model_construct(
+            span_id=span_id,
+            trace_id=trace_id,
+            parent_span_id=span.parent_span_id,
+            name=span.name,
+            span_type=span.span_type,
+            start_time=start_time,
+            end_time=None,
+            duration_ms=None,
+            input_data=span.input_data or {},
+            output_data=span.output_data or {},
+            metadata=span.metadata or {},
+            model=span.model,
+            tokens_input=span.tokens_input,
+            tokens_output=span.tokens_output,
+            cost_usd=span.cost_usd,
+            error=span.error,
+        )
 
     def to_dynamodb_item(self) -> Dict[str, Any]:
         """Convert to DynamoDB compatible Dictionary.
@@ -367,13 +689,16 @@ class Span(BaseModel):
         # Import here to avoid circular import
         from .storage_dynamodb import stringify_for_dynamodb
 
-        item = self.model_dump(exclude_none=True)
-        if isinstance(item.get("start_time"), datetime):
-            item["start_time"] = item["start_time"].isoformat()
-        if isinstance(item.get("end_time"), datetime):
-            item["end_time"] = item["end_time"].isoformat()
-        if item.get("cost_usd") is not None:
-            item["cost_usd"] = Decimal(str(item["cost_usd"]))
+        item: Dict[str, Any] = {}
+        for key in _SPAN_FIELDS:
+            value = getattr(self, key)
+            if value is None:
+                continue
+            if isinstance(value, datetime):
+                value = value.isoformat()
+            item[key] = value
+        if "cost_usd" in item:
+            item["cost_usd"] = _to_decimal(item["cost_usd"])
         # Stringify input_data and output_data to handle floats and other types
         if item.get("input_data"):
             item["input_data"] = stringify_for_dynamodb(item["input_data"])
@@ -383,6 +708,9 @@ class Span(BaseModel):
         return item
 
 
+_SPAN_FIELDS = tuple(Span.model_fields)
+
+
 class TraceQuery(BaseModel):
     """Query parameters for filtering traces from DynamoDB"""
     
@@ -415,19 +743,18 @@ class SpanCompleteRequest(BaseModel):
     cost_usd: Optional[float] = Field(None, ge=0)
     metdata: Optional[Dict[str, Any]] = None
 
-    @field_validator("output_data")
-    @classmethod
-    def truncate_output_data(cls, v: Optional[Dict]) -> Optional[Dict]:
-        """Truncate output data to fit DynamoDB item size limit"""
-        if not v:
-            return v
-        return truncate_dict(v, MAX_INPUT_OUTPUT_SIZE, "SpanCompleteRequest.output_data")
-    
-    @field_validator("error")
-    @classmethod
-    def truncate_error(cls, v: Optional[str]) -> Optional[str]:
-        """Truncate error message"""
-        return truncate_string(v, MAX_STRING_LENGTH, "SpanCompleteRequest.error")
+    @model_validator(mode="after")
+    def truncate_payload_fields(self) -> "SpanCompleteRequest":
+        """Truncate output data and error message to fit DynamoDB limits."""
+        if self.output_data:
+            self.output_data = truncate_dict(
+                self.output_data, MAX_INPUT_OUTPUT_SIZE, "SpanCompleteRequest.output_data"
+            )
+        if self.error:
+            self.error = truncate_string(
+                self.error, MAX_STRING_LENGTH, "SpanCompleteRequest.error"
+            )
+        return self
 
 
 class TraceCompleteRequest(BaseModel):
@@ -436,8 +763,11 @@ class TraceCompleteRequest(BaseModel):
     output: Optional[str] = None
     metadata: Optional[Dict[str, Any]] = None
 
-    @field_validator("output")
-    @classmethod
-    def truncate_output(cls, v: Optional[str]) -> Optional[str]:
+    @model_validator(mode="after")
+    def truncate_payload_fields(self) -> "TraceCompleteRequest":
         """Truncate output to fit DynamoDB item size limit"""
-        return truncate_string(v, MAX_STRING_LENGTH, "TraceCompleteRequest.output")
+        if self.output:
+            self.output = truncate_string(
+                self.output, MAX_STRING_LENGTH, "TraceCompleteRequest.output"
+            )
+        return self
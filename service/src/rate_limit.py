@@ -4,38 +4,81 @@ Simple in-memory rate limiter.
 To prevent abuse, the service is rate-limited to 60 requests per minute per project.
 """
 
+import asyncio
 import time
-from collections import defaultdict
 from fastapi import Request, HTTPException, status
 
+# Drop stale per-IP buffers this often so memory doesn't grow with the
+# number of unique client IPs ever seen.
+SWEEP_INTERVAL_SECONDS = 300
+
+# Ring-buffer slot value meaning "never requested"; any real timestamp
+# is further than the window from it, so empty slots always admit.
+_EMPTY = float("-inf")
+
 
 class RateLimiter:
-    """In memory rate limiter using sliding window algorithm"""
+    """In memory rate limiter using sliding window algorithm.
+
+    Each client gets a fixed-size ring buffer of its last `rpm` request
+    timestamps. A request is admitted iff the timestamp it would
+    overwrite (the oldest of the last `rpm`) has left the window, which
+    makes admission a single comparison — no eviction loop and no
+    per-request allocation.
+    """
 
     def __init__(
         self,
         requests_per_minute: int = 60,
         window_seconds: int = 60,
+        time_source=time.monotonic,
         ):
         self.rpm = requests_per_minute
         self.window = window_seconds
-        self.requests = defaultdict(list)  #  client_ip -> list of request timestamps
+        self.requests = {}  # client_ip -> [ring buffer of timestamps, write index]
+        # Injectable clock so tests can advance time instead of sleeping
+        # through real windows; production always uses time.monotonic.
+        self._now = time_source
+        # One process-wide lock is plenty at this scale; it only guards
+        # the read-modify-write below against interleaving.
+        self._lock = asyncio.Lock()
+        self._next_sweep = self._now() + SWEEP_INTERVAL_SECONDS
 
     async def check_rate_limit(self, request: Request):
         """Check if request exceeds rate limit."""
         client_ip = request.client.host
-        current_time = time.time()  # float type time value in seconds 
+        # Monotonic clock: immune to NTP skew / wall-clock jumps, which
+        # would otherwise stretch or collapse the sliding window.
+        current_time = self._now()
 
-        # Remove old requests (older than 1 minute)
-        self.requests[client_ip] = [
-            req_time for req_time in self.requests[client_ip]
-            if current_time - req_time < self.window  # This is a time window, different from rpm=60!
-        ]
+        async with self._lock:
+            entry = self.requests.get(client_ip)
+            if entry is None:
+                entry = self.requests[client_ip] = [[_EMPTY] * self.rpm, 0]
+            buf, idx = entry
 
-        if len(self.requests[client_ip]) >= self.rpm:
-            raise HTTPException(
-                status_code=status.HTTP_429_TOO_MANY_REQUESTS,
-                detail=f"Rate limit exceeded. Max allowed {self.rpm} requests per {self.window} seconds.",
-            )
+            # The slot about to be overwritten holds the oldest of the
+            # client's last rpm timestamps. If it is still inside the
+            # window, admitting would make rpm+1 requests in-window.
+            if current_time - buf[idx] < self.window:  # This is a time window, different from rpm=60!
+                raise HTTPException(
+                    status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+                    detail=f"Rate limit exceeded. Max allowed {self.rpm} requests per {self.window} seconds.",
+                )
 
-        self.requests[client_ip].append(current_time)
+            buf[idx] = current_time
+            entry[1] = (idx + 1) % self.rpm
+
+            if current_time >= self._next_sweep:
+                self._sweep(current_time - self.window)
+                self._next_sweep = current_time + SWEEP_INTERVAL_SECONDS
+
+    def _sweep(self, cutoff: float):
+        """Drop per-IP entries whose newest timestamp fell out of the window."""
+        stale = [
+            ip
+            for ip, (buf, idx) in self.requests.items()
+            if buf[idx - 1] <= cutoff  # newest write sits just before idx
+        ]
+        for ip in stale:
+            del self.requests[ip]
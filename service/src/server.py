@@ -1,14 +1,17 @@
 """A custom LLM tracing service"""
 
 import os
+import gzip
+import hashlib
 import logging
 from datetime import datetime, UTC
 from typing import List, Optional, Dict, Any
 from uuid import uuid4
 
 from dotenv import load_dotenv, find_dotenv
-from fastapi import FastAPI, HTTPException, Query, Header, Depends, Request
-from fastapi.responses import HTMLResponse
+from fastapi import FastAPI, HTTPException, Query, Header, Depends, Request, Response
+import orjson
+from fastapi.responses import HTMLResponse, ORJSONResponse, StreamingResponse
 from fastapi.staticfiles import StaticFiles
 from fastapi.middleware.cors import CORSMiddleware
 from pydantic import BaseModel, Field
@@ -31,6 +34,10 @@ app = FastAPI(
     title = "LLM Tracer",
     description = "A self hosted LLM tracing and observability solution with multi-project support",
     version = "1.0.0",
+    # orjson is several times faster than stdlib json at encoding; the
+    # trace-detail endpoint (trace + all spans) is the heaviest payload
+    # and serialization time counts directly against Lambda duration.
+    default_response_class=ORJSONResponse,
 )
 
 
@@ -82,15 +89,11 @@ async def create_trace(
             )
         
         trace_id = str(uuid4())
-        trace_obj = Trace(
+        trace_obj = Trace.from_trusted(
+            trace,
             trace_id=trace_id,
-            name=trace.name,
             project_id=api_project_id,
             start_time=datetime.now(UTC),
-            tags=trace.tags or [],
-            metadata=trace.metadata,
-            user_id=trace.user_id,
-            session_id=trace.session_id,
         )
 
         await storage.save_trace(trace_obj)
@@ -120,35 +123,23 @@ async def create_span(
         # validate API key and get project_id
         api_project_id = extract_project_id(x_api_key)
 
-        # Security check: verify trace belongs to project
-        trace = await storage.get_trace(trace_id, project_id=api_project_id)
-        if not trace:
+        # Security check: verify trace belongs to project (key-only read,
+        # no need to pull the full trace item here)
+        if not await storage.verify_trace_ownership(trace_id, api_project_id):
             raise HTTPException(
-                status_code=404, 
+                status_code=404,
                 detail=f"Trace {trace_id} not found for project {api_project_id}"
             )
 
         span_id = str(uuid4())
-        span_data = Span(
+        span_data = Span.from_trusted(
+            span,
             span_id=span_id,
             trace_id=trace_id,
-            parent_span_id=span.parent_span_id,
-            name=span.name,
-            span_type=span.span_type,
             start_time=datetime.now(UTC),
-            end_time=None,
-            duration_ms=None,
-            input_data=span.input_data or {},
-            output_data=span.output_data or {},
-            metadata=span.metadata or {},
-            model=span.model,
-            tokens_input=span.tokens_input,
-            tokens_output=span.tokens_output,
-            cost_usd=span.cost_usd,
-            error=span.error,
         )
 
-        await storage.save_span(span_data)
+        await storage.save_span(span_data, project_id=api_project_id)
         logger.info(f"Created span: {span_id} - {span.name} in trace {trace_id}")
 
         return {"span_id": span_id, "status": "created"}
@@ -161,6 +152,52 @@ async def create_span(
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@app.post("/api/traces/{trace_id}/spans/batch", response_model=Dict[str, Any])
+async def create_spans_batch(
+    trace_id: str,
+    spans: List[SpanCreate],
+    x_api_key: str = Depends(get_api_key)
+):
+    """Add multiple spans to a trace in one request. Requires API key.
+
+    Declaring the body as List[SpanCreate] lets pydantic validate the
+    whole batch in a single pydantic_core pass, and the trace ownership
+    check runs once instead of once per span.
+    """
+    try:
+        # validate API key and get project_id
+        api_project_id = extract_project_id(x_api_key)
+
+        # Security check: verify trace belongs to project (once per batch)
+        if not await storage.verify_trace_ownership(trace_id, api_project_id):
+            raise HTTPException(
+                status_code=404,
+                detail=f"Trace {trace_id} not found for project {api_project_id}"
+            )
+
+        now = datetime.now(UTC)
+        span_objects = [
+            Span.from_trusted(
+                span, span_id=str(uuid4()), trace_id=trace_id, start_time=now
+            )
+            for span in spans
+        ]
+        span_ids = await storage.save_spans_batch(
+            span_objects, project_id=api_project_id
+        )
+
+        logger.info(f"Created {len(span_ids)} spans in trace {trace_id}")
+
+        return {"span_ids": span_ids, "status": "created"}
+
+    except HTTPException:
+        raise
+
+    except Exception as e:
+        logger.error(f"Error creating span batch: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+
 # Patch for partial field updates incrementally as the Agent progresses for a specific trace_id
 @app.patch("/api/spans/{span_id}/complete")
 async def complete_span(
@@ -178,15 +215,17 @@ async def complete_span(
         if not span:
             raise HTTPException(status_code=404, detail=f"Span {span_id} not found")
 
-        # Verify trace ownership
-        trace = await storage.get_trace(span['trace_id'], project_id=api_project_id)
-        if not trace:
+        # Verify trace ownership (projection read: the trace payload itself
+        # isn't needed, only the ownership attribute)
+        if not await storage.verify_trace_ownership(span['trace_id'], api_project_id):
             raise HTTPException(
                 status_code=403,
                 detail=f"Span {span_id} belongs to a trace not owned by this project {api_project_id}"
             )
         
         end_time = datetime.now(UTC)
+        # The span was just read for the ownership check; hand its
+        # start_time/trace_id over so storage skips a second read.
         await storage.complete_span(
             span_id=span_id,
             end_time=end_time,
@@ -195,6 +234,9 @@ async def complete_span(
             tokens_input=request.tokens_input,
             tokens_output=request.tokens_output,
             cost_usd=request.cost_usd,
+            trace_id=span["trace_id"],
+            start_time=span["start_time"],
+            project_id=api_project_id,
         )
 
         logger.info(f"Completed span: {span_id}")
@@ -218,8 +260,8 @@ async def complete_trace(
     try:
         # Validate API key and trace to be completed belongs to the project
         api_project_id = extract_project_id(x_api_key)
-        
-        trace = await storage.get_trace(trace_id, project_id=api_project_id)
+
+        trace = await storage.verify_trace_ownership(trace_id, api_project_id)
         if not trace:
             raise HTTPException(
                 status_code=404,
@@ -227,10 +269,13 @@ async def complete_trace(
             )
 
         end_time = datetime.now(UTC)
+        # The ownership check projects start_time; passing it along lets
+        # storage complete the trace with a single update_item.
         await storage.complete_trace(
             trace_id=trace_id,
             end_time=end_time,
             output=request.output,
+            start_time=trace["start_time"],
         )
 
         logger.info(f"Completed trace: {trace_id}")
@@ -263,39 +308,71 @@ async def get_traces(
 
         tag_list = tags.split(",") if tags else None  # this is how Trace model stores tags
 
-        # Object for filterimng traces from DB
-        query = TraceQuery(
+        # Object for filterimng traces from DB. Internal carrier built
+        # from values FastAPI already validated (Query bounds, API key),
+        # so skip pydantic's validator pass.
+        query = TraceQuery.model_construct(
             project_id=api_project_id,
             limit=limit,
             cursor=cursor,
             user_id=user_id,
             session_id=session_id,
             tags=tag_list,
+            start_time_from=None,
+            start_time_to=None,
         )
         result = await storage.get_traces(query)
 
-        # span_count and total_cost are now denormalized on the trace record
-        return TraceListResponse(
-            traces=result.get("items", []),
-            next_cursor=result.get("next_cursor", None),
-            has_more=result.get("next_cursor") is not None,
-            count=len(result.get("items", []))
-        )
+        # span_count and total_cost are now denormalized on the trace record.
+        # Returning a Response object bypasses FastAPI's response_model
+        # re-validation and jsonable_encoder pass: the items come straight
+        # from storage we control (already Decimal-free), and re-validating
+        # hundreds of dicts dominated this endpoint's CPU. response_model
+        # stays on the route purely for the OpenAPI schema.
+        items = result.get("items", [])
+        next_cursor = result.get("next_cursor", None)
+        return ORJSONResponse({
+            "traces": items,
+            "next_cursor": next_cursor,
+            "has_more": next_cursor is not None,
+            "count": len(items),
+        })
     
     except HTTPException:
         raise
-    
+
+    except ValueError as e:
+        # Malformed pagination cursor
+        raise HTTPException(status_code=400, detail=str(e))
+
     except Exception as e:
         logger.error(f"Error querying traces: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
 
+def _ndjson_trace_detail(trace: Dict, spans: List[Dict]):
+    """Yield a trace detail payload as NDJSON lines.
+
+    First line carries the trace object as a sentinel ({"trace": ...}),
+    followed by one span per line. Streaming spans individually lets large
+    traces start rendering before the full payload has been transferred.
+    """
+    yield orjson.dumps({"trace": trace}) + b"\n"
+    for span in spans:
+        yield orjson.dumps(span) + b"\n"
+
+
 @app.get("/api/traces/{trace_id}", response_model=Dict[str, Any])
 async def get_trace(
     trace_id: str,
+    request: Request,
     x_api_key: str = Depends(get_api_key)
 ):
-    """Get a complete trace with all its spans. requires API key for authentication"""
+    """Get a complete trace with all its spans. requires API key for authentication
+
+    Clients that send `Accept: application/x-ndjson` get the payload
+    streamed one span per line instead of a single JSON document.
+    """
     try:
         # Get project_id from API key
         api_project_id = extract_project_id(x_api_key)
@@ -306,8 +383,15 @@ async def get_trace(
                 status_code=404,
                 detail=f"Trace {trace_id} not found for project {api_project_id}"
             )
-        
+
         spans = await storage.get_spans(trace_id, project_id=api_project_id)
+
+        if "application/x-ndjson" in request.headers.get("accept", ""):
+            return StreamingResponse(
+                _ndjson_trace_detail(trace, spans),
+                media_type="application/x-ndjson",
+            )
+
         return {
             "trace": trace,
             "spans": spans,
@@ -323,20 +407,44 @@ async def get_trace(
 
 
 @app.get("/api/stats")
-async def get_stats(    
+async def get_stats(
+    request: Request,
     x_api_key: str = Depends(get_api_key)
 ):
-    """Get overall statistics; requires API key for authentication"""
+    """Get overall statistics; requires API key for authentication.
+
+    Supports ETag revalidation: the dashboard polls this endpoint, and a
+    matching If-None-Match answers 304 after one light fingerprint read
+    instead of the full per-trace span fan-out.
+    """
     try:
         # Get project_id from API key
         api_project_id = extract_project_id(x_api_key)
 
+        etag = None
+        fingerprint = await storage.get_stats_fingerprint(api_project_id)
+        if fingerprint:
+            digest = hashlib.blake2b(
+                f"{api_project_id}:{fingerprint}".encode(), digest_size=16
+            ).hexdigest()
+            etag = f'"{digest}"'
+            if request.headers.get("if-none-match") == etag:
+                return Response(status_code=304, headers={"ETag": etag})
+
         stats = await storage.get_stats(project_id=api_project_id)
+        if etag:
+            return ORJSONResponse(
+                stats,
+                headers={
+                    "ETag": etag,
+                    "Cache-Control": "private, max-age=5, must-revalidate",
+                },
+            )
         return stats
-    
+
     except HTTPException:
         raise
-    
+
     except Exception as e:
         logger.error(f"Error getting stats: {e}")
         raise HTTPException(status_code=500, detail=str(e))
@@ -346,10 +454,7 @@ async def get_stats(
 # DASHBOARD
 #==============
 
-@app.get("/", response_class=HTMLResponse)
-async def dashboard():
-    """Simple Dashboard UI"""
-    html = """
+_DASHBOARD_HTML = """
       <!DOCTYPE html>
         <html>
         <head>
@@ -508,7 +613,34 @@ async def dashboard():
         </html>
       """
 
-    return html
+# Precomputed at import: the page is static, so every request shares one
+# gzip body and a strong ETag instead of re-allocating the HTML string.
+_DASHBOARD_GZIP = gzip.compress(_DASHBOARD_HTML.encode(), 9)
+_DASHBOARD_ETAG = '"' + hashlib.blake2s(_DASHBOARD_HTML.encode()).hexdigest()[:16] + '"'
+_DASHBOARD_HEADERS = {"ETag": _DASHBOARD_ETAG, "Cache-Control": "public, max-age=3600"}
+
+
+@app.get("/", response_class=HTMLResponse)
+async def dashboard(request: Request):
+    """Simple Dashboard UI. Static content: served precompressed with an ETag.
+
+    The page intentionally stays static rather than server-rendering the
+    initial stats/traces: the project API key is typed in client-side, so
+    a plain browser navigation to "/" carries no credentials to query
+    with. The data endpoints it calls carry their own ETag/Cache-Control,
+    which is where repeat-view revalidation happens.
+    """
+    if request.headers.get("if-none-match") == _DASHBOARD_ETAG:
+        return Response(status_code=304, headers=_DASHBOARD_HEADERS)
+
+    if "gzip" in request.headers.get("accept-encoding", ""):
+        return Response(
+            content=_DASHBOARD_GZIP,
+            media_type="text/html",
+            headers={**_DASHBOARD_HEADERS, "Content-Encoding": "gzip"},
+        )
+
+    return HTMLResponse(_DASHBOARD_HTML, headers=_DASHBOARD_HEADERS)
 
 
 @app.get("/health")
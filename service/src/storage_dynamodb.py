@@ -1,22 +1,57 @@
 """DynamoDB storage backend for LLM tracer."""
 
+import asyncio
 import os
+from concurrent.futures import ThreadPoolExecutor
 import time
 import logging
 import base64
-import json
 from decimal import Decimal
 from typing import Dict, List, Optional, Any, Union
 from datetime import datetime, timezone
 
 import boto3
-from boto3.dynamodb.conditions import Key
+import orjson
+from boto3.dynamodb.conditions import Attr, Key
 from botocore.exceptions import ClientError
 
 from .models import Trace, Span, TraceQuery
 
 logger = logging.getLogger(__name__)
 
+# Items auto-delete 90 days after they are written
+TTL_SECONDS = 90 * 24 * 60 * 60
+
+
+def _encode_cursor(last_key: Dict) -> str:
+    """Encode a DynamoDB LastEvaluatedKey as an opaque URL-safe cursor.
+
+    orjson plus unpadded urlsafe base64 is faster to (de)serialize and
+    noticeably shorter on the wire than json.dumps + standard base64.
+    Signing isn't needed: ExclusiveStartKey must match the query's key
+    condition, so DynamoDB rejects cursors forged for another project.
+
+    Cursors are deliberately stateless. Holding LastEvaluatedKeys in a
+    server-side store behind short cursor ids would need shared
+    infrastructure this Lambda deployment doesn't have, and any one
+    instance's cache would miss for cursors minted by another.
+    """
+    return (
+        base64.urlsafe_b64encode(orjson.dumps(last_key, default=str))
+        .rstrip(b"=")
+        .decode()
+    )
+
+
+def _decode_cursor(cursor: str) -> Optional[Dict]:
+    """Decode a cursor back into an ExclusiveStartKey, or None if invalid."""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        return orjson.loads(base64.urlsafe_b64decode(padded))
+    except Exception:
+        logger.warning(f"Ignoring invalid pagination cursor: {cursor!r}")
+        return None
+
 
 def convert_decimals(obj: Any) -> Any:
     """Convert DynamoDB Decimal types to native Python int/float.
@@ -63,7 +98,12 @@ def stringify_for_dynamodb(obj: Any) -> Any:
 
 
 class DynamoDBStorage:
-    """DynamoDB storage backend for traces and spans"""
+    """DynamoDB storage backend for traces and spans.
+
+    boto3 is synchronous, so every DynamoDB call here is offloaded via
+    asyncio.to_thread — otherwise each request would block the event
+    loop for a full DynamoDB round trip and serialize all traffic.
+    """
 
     def __init__(
         self,
@@ -71,6 +111,7 @@ class DynamoDBStorage:
         spans_table_name: Optional[str] = None,
         endpoint_url: Optional[str] = None,
         region_name: Optional[str] = None,
+        session: Optional[boto3.session.Session] = None,
     ):
         """Initialize DynamoDB storage backend
         
@@ -84,7 +125,13 @@ class DynamoDBStorage:
             The endpoint URL for the DynamoDB service. If not provided, the value of the DYNAMODB_ENDPOINT_URL environment variable is used.
         region_name : Optional[str]
             The region name for the DynamoDB service. If not provided, the value of the AWS_REGION environment variable is used.
-        
+        session : Optional[boto3.session.Session]
+            An existing boto3 session to build the resource from. Callers
+            creating several storage instances (notably the test suite) can
+            share one session — and with it one resolved credential chain and
+            one HTTP connection pool — instead of paying session setup per
+            instance. If not provided, the boto3 default session is used.
+
         """
         self.traces_table_name = traces_table_name or os.getenv(
             "DYNAMODB_TRACES_TABLE", "llm-tracer-dev-traces"
@@ -105,10 +152,21 @@ class DynamoDBStorage:
             kwargs["aws_secret_access_key"] = os.getenv("AWS_SECRET_ACCESS_KEY", "test")
 
 
-        self.dynamodb = boto3.resource("dynamodb", **kwargs)
+        resource_factory = session.resource if session else boto3.resource
+        self.dynamodb = resource_factory("dynamodb", **kwargs)
         self.traces_table = self.dynamodb.Table(self.traces_table_name)
+        # Spans are keyed by span_id with a trace-index GSI for the
+        # by-trace reads. Re-keying to (trace_id, span_id) would halve
+        # the RCU cost of the dominant by-trace access, but DynamoDB key
+        # schemas are immutable — that's a new-table migration, not a
+        # code change here.
         self.spans_table = self.dynamodb.Table(self.spans_table_name)
 
+        # Bounded pool for the stats fan-out: up to 50 concurrent span
+        # queries would otherwise monopolize the default executor that
+        # every other request's DynamoDB call runs on
+        self._stats_pool = ThreadPoolExecutor(max_workers=16)
+
         logger.info(
             f"DynamoDB Storage initialized: traces = {self.traces_table_name}, "
             f"spans = {self.spans_table_name}, "
@@ -119,23 +177,23 @@ class DynamoDBStorage:
         """Return storage type identifier"""
         return "dynamodb"
 
-    def _add_ttl(self, item: Dict, days: int = 90) -> Dict:
+    def _add_ttl(self, item: Dict, ttl: Optional[int] = None) -> Dict:
         """Add TTL (Time to Live) to item for auto-deletion.
-        
+
         Parameters
         ----------
         item : Dict
             The item to add TTL to.
-        days : int, optional
-            The number of days until deletion, by default 90.
-        
+        ttl : Optional[int]
+            A precomputed epoch expiry, for callers stamping many items
+            in one request; computed from "now" when omitted.
+
         Returns
         -------
         Dict
             The item with TTL field added.
         """
-        ttl = int(time.time()) + (days * 24*60*60)
-        item["ttl"] = ttl
+        item["ttl"] = ttl if ttl is not None else int(time.time()) + TTL_SECONDS
         return item
     
     def _validate_datetime(
@@ -180,26 +238,29 @@ class DynamoDBStorage:
           - "not a date"
           - 1234567890 (timestamp int)
         """
-        if isinstance(value, datetime):
+        # type() over isinstance(): the inputs are monomorphic (plain
+        # datetime or str, never subclasses) and the exact-type check is
+        # measurably cheaper on the per-write path
+        t = type(value)
+        if t is datetime:
             if value.tzinfo is None:
                 raise ValueError(
                     f"{field_name}: datetime must be timezone-aware. "
                     f"Use datetime.now(timezone.utc) instead of datetime.now()."
                 )
             return value
-        
-        if isinstance(value, str):
+
+        if t is str:
             try:
-                # handle 'Z' suffix for UTC
-                normalized = value.replace("Z", "+00:00") if value.endswith("Z") else value
-                return datetime.fromisoformat(normalized)
+                # fromisoformat handles the trailing "Z" natively on 3.12
+                return datetime.fromisoformat(value)
             except ValueError as e:
                 raise ValueError(
                     f"{field_name}: Invalid ISO format string '{value}'. "
                     f"Expected format: 'YYYY-MM-DDTHH:MM:SS+00:00' or 'YYYY-MM-DDTHH:MM:SSZ'. "
                     f"Parse error: {e}"
-                )
-        
+                ) from None
+
         raise ValueError(
             f"Invalid datetime format for {field_name}, got {type(value).__name__}"
         )
@@ -218,19 +279,20 @@ class DynamoDBStorage:
         str
             The trace ID
         """
-        # Validate first whether datetime fields are valid
-        self._validate_datetime(trace.start_time, "trace.start_time")
-        if trace.end_time is not None:
-            self._validate_datetime(trace.end_time, "trace.end_time")
+        # Datetime fields are already tz-aware here: the model validator
+        # enforces it, so no per-write re-validation.
         # Use model's serialisation method
         trace_dict = trace.to_dynamodb_item()
 
         # Add TTL for auto-deletion after 90 days
         trace_dict = self._add_ttl(trace_dict)
 
-        # put item in dynamodb
-        self.traces_table.put_item(Item=trace_dict)
-        
+        # put item in dynamodb (off the event loop: boto3 is blocking)
+        await asyncio.to_thread(self.traces_table.put_item, Item=trace_dict)
+
+        # Keep the materialized per-project stats counters current
+        await self._bump_stats(trace.project_id, traces=1)
+
         logger.debug(f"Saved trace: {trace_dict['trace_id']}")
         return trace_dict['trace_id']
     
@@ -254,7 +316,9 @@ class DynamoDBStorage:
             The trace data dictionary if found, None otherwise.
         """
         try:
-            response = self.traces_table.get_item(Key={"trace_id": trace_id})
+            response = await asyncio.to_thread(
+                self.traces_table.get_item, Key={"trace_id": trace_id}
+            )
             item = response.get("Item")
             if not item:
                 return None
@@ -275,6 +339,51 @@ class DynamoDBStorage:
             logger.error(f"Error getting trace {trace_id}: {e}")
             return None
 
+    async def verify_trace_ownership(
+        self, trace_id: str, project_id: str
+    ) -> Optional[Dict]:
+        """Check that a trace exists and belongs to a project.
+
+        Fetches only project_id and start_time via ProjectionExpression
+        instead of the full (up to 400KB) trace item, for endpoints that
+        need the ownership check but not the trace payload. start_time is
+        included so completion endpoints can pass it straight to
+        `complete_trace` without a second read.
+
+        Parameters
+        ----------
+        trace_id : str
+            The trace ID to check.
+        project_id : str
+            The project ID that must own the trace.
+
+        Returns
+        -------
+        Optional[Dict]
+            The projected item (project_id, start_time) if the trace
+            exists and belongs to the project, None otherwise.
+        """
+        try:
+            response = await asyncio.to_thread(
+                self.traces_table.get_item,
+                Key={"trace_id": trace_id},
+                ProjectionExpression="project_id, start_time",
+            )
+            item = response.get("Item")
+            if not item:
+                return None
+            if item.get("project_id") != project_id:
+                logger.warning(
+                    f"Access Denied: trace {trace_id} does not belong to "
+                    f"project {project_id}"
+                )
+                return None
+            return item
+
+        except ClientError as e:
+            logger.error(f"Error verifying trace {trace_id}: {e}")
+            return None
+
     async def get_traces(self, query: TraceQuery) -> List[Dict]:
         """Query traces with filters.
 
@@ -289,46 +398,75 @@ class DynamoDBStorage:
             Dict with 'items' (list of traces) and 'next_cursor' (for pagination)
         """
         try:
+            # List views never show the unbounded blobs (metadata, output)
+            # — project the summary fields so they aren't shipped at all.
+            # "name" is a DynamoDB reserved word, hence the alias.
             query_kwargs = {
                 "IndexName": "project-time-index",
                 "KeyConditionExpression": Key("project_id").eq(query.project_id),
                 "ScanIndexForward": False,  # Newest first
                 "Limit": query.limit,
+                "ProjectionExpression": (
+                    "trace_id, #n, project_id, start_time, end_time, "
+                    "duration_ms, tags, user_id, session_id, span_count, "
+                    "total_cost"
+                ),
+                "ExpressionAttributeNames": {"#n": "name"},
             }
 
+            # Push optional filters into DynamoDB so non-matching items
+            # are discarded server-side instead of shipped back and
+            # filtered in Python
+            filter_expr = None
+            if query.user_id:
+                filter_expr = Attr("user_id").eq(query.user_id)
+            if query.session_id:
+                cond = Attr("session_id").eq(query.session_id)
+                filter_expr = cond if filter_expr is None else filter_expr & cond
+            if query.tags:
+                # Match traces carrying ANY of the requested tags
+                tags_expr = None
+                for tag in query.tags:
+                    cond = Attr("tags").contains(tag)
+                    tags_expr = cond if tags_expr is None else tags_expr | cond
+                filter_expr = (
+                    tags_expr if filter_expr is None else filter_expr & tags_expr
+                )
+            if filter_expr is not None:
+                query_kwargs["FilterExpression"] = filter_expr
+
             # Handel cursor (LastEvaluatedKey from previous query)
             if query.cursor:
-                try:
-                    decoded = base64.b64decode(query.cursor).decode("utf-8")
-                    query_kwargs["ExclusiveStartKey"] = json.loads(decoded)
-                except Exception as e:
-                    pass  # Invalid cursor, start from the beginning
-
-            response = self.traces_table.query(**query_kwargs)
-            items = response.get("Items", [])
-            
+                start_key = _decode_cursor(query.cursor)
+                if start_key is None:
+                    # Reject before touching DynamoDB: silently restarting
+                    # from page one paid a full page read per garbage cursor
+                    raise ValueError("Invalid pagination cursor")
+                query_kwargs["ExclusiveStartKey"] = start_key
+
+            # FilterExpression applies after Limit, so a filtered page can
+            # come back short; keep paging until the caller's limit is met
+            # or the index is exhausted
+            items = []
+            while True:
+                response = await asyncio.to_thread(
+                    self.traces_table.query, **query_kwargs
+                )
+                items.extend(response.get("Items", []))
+                last_key = response.get("LastEvaluatedKey")
+                if len(items) >= query.limit or not last_key:
+                    break
+                query_kwargs["ExclusiveStartKey"] = last_key
+                query_kwargs["Limit"] = query.limit - len(items)
+
             # Remove TTL from all items
             for item in items:
                 item.pop("ttl", None)
-            
-            # Apply optional filters (post-query filtering)
-            if query.user_id:
-                items = [i for i in items if i.get("user_id") == query.user_id]
-            
-            if query.session_id:
-                items = [i for i in items if i.get("session_id") == query.session_id]
-            
-            if query.tags:
-                items = [
-                    i for i in items
-                    if any(tag in i.get("tags", []) for tag in query.tags)
-                ]
-            
+
             # Build next cursor from LastEvaluatedKey
             next_cursor = None
-            last_key = response.get("LastEvaluatedKey")
             if last_key:
-                next_cursor = base64.b64encode(json.dumps(last_key).encode()).decode()
+                next_cursor = _encode_cursor(last_key)
             
             return {
                 "items": [convert_decimals(item) for item in items],
@@ -344,6 +482,7 @@ class DynamoDBStorage:
         trace_id: str,
         end_time: datetime,
         output: Optional[str] = None,
+        start_time: Optional[datetime | str] = None,
     ) -> bool:
         """Update a trace as to be completed..
 
@@ -355,6 +494,10 @@ class DynamoDBStorage:
             Completion timestamp.
         output : Optional[str]
             Final output.
+        start_time : Optional[datetime | str]
+            Trace start, if the caller already has it (e.g. from the
+            ownership check). Skips the extra read round-trip needed to
+            compute duration_ms; when None it is fetched here.
 
         Returns
         -------
@@ -391,19 +534,24 @@ class DynamoDBStorage:
         end_time = self._validate_datetime(end_time, "end_time")
 
         try:
-            # Get current trace to calculate duration
-            trace = await self.get_trace(trace_id)
-            if not trace:
-                logger.error(f"Trace {trace_id} not found")
-                return False
-            
+            # Fetch start_time only if the caller couldn't supply it
+            if start_time is None:
+                response = await asyncio.to_thread(
+                    self.traces_table.get_item,
+                    Key={"trace_id": trace_id},
+                    ProjectionExpression="start_time",
+                )
+                item = response.get("Item")
+                if not item:
+                    logger.error(f"Trace {trace_id} not found")
+                    return False
+                start_time = item["start_time"]
+
             # Calculate duration
-            start_time_str = trace['start_time']
-            if start_time_str.endswith("Z"):
-                start_time_str = start_time_str.replace("Z", "+00:00")
-            start_time = datetime.fromisoformat(start_time_str)
+            if isinstance(start_time, str):
+                start_time = datetime.fromisoformat(start_time)
             duration_ms = int((end_time - start_time).total_seconds() * 1000)
-            
+
             # Build update expression
             # Note: "output" is a DynamoDB reserved keyword, use #output alias
             update_expr = "SET end_time = :end_time, duration_ms = :duration_ms"
@@ -418,55 +566,66 @@ class DynamoDBStorage:
                 expr_attr_values[":output"] = output
                 expr_attr_names["#output"] = "output"
 
-            # Update trace
+            # Update trace; the condition stops the fast path (start_time
+            # passed in, no read above) from upserting a missing trace
             update_kwargs = {
                 "Key": {"trace_id": trace_id},
                 "UpdateExpression": update_expr,
+                "ConditionExpression": "attribute_exists(trace_id)",
                 "ExpressionAttributeValues": expr_attr_values,
             }
             if expr_attr_names:
                 update_kwargs["ExpressionAttributeNames"] = expr_attr_names
 
-            self.traces_table.update_item(**update_kwargs)
+            await asyncio.to_thread(self.traces_table.update_item, **update_kwargs)
 
             logger.debug(f"Completed trace: {trace_id} (duration: {duration_ms} ms)")
             return True
 
+        except ClientError as e:
+            if e.response["Error"]["Code"] == "ConditionalCheckFailedException":
+                logger.error(f"Trace {trace_id} not found")
+            else:
+                logger.error(f"Error updating trace {trace_id}: {e}")
+            return False
+
         except Exception as e:
             logger.error(f"Error updating trace {trace_id}: {e}")
             return False
 
 
-    async def save_span(self, span: Span) -> str:
+    async def save_span(self, span: Span, project_id: Optional[str] = None) -> str:
         """Save a span to DynamoDB.
 
         Parameters
         ----------
         span : Span
             The Span model object to save.
+        project_id : Optional[str]
+            Owning project, if the caller knows it (spans don't carry
+            one). Needed to keep the materialized stats counters current;
+            when None the counters are left alone.
 
         Returns
         -------
         str
             The span ID
         """
-        # Validate datetime format in Span object
-        self._validate_datetime(span.start_time, "span.start_time")
-        if span.end_time is not None:
-            self._validate_datetime(span.end_time, "span.end_time")
-
+        # Datetime fields are already tz-aware here: the model validator
+        # enforces it, so no per-write re-validation.
         # Use model's serialisation method (handles Decimal conversion for cost_usd)
         span_dict = span.to_dynamodb_item()
 
         # Add TTL for auto-deletion
         span_dict = self._add_ttl(span_dict)
 
-        # put item in dynamodb
-        self.spans_table.put_item(Item=span_dict)
+        # put item in dynamodb (off the event loop: boto3 is blocking)
+        await asyncio.to_thread(self.spans_table.put_item, Item=span_dict)
 
         # Atomically increment span_count on the parent trace (denormalization)
         try:
-            self.traces_table.update_item(
+            await asyncio.to_thread(
+                self.traces_table.update_item,
                 Key={"trace_id": span.trace_id},
                 UpdateExpression="ADD span_count :inc",
                 ExpressionAttributeValues={":inc": 1}
@@ -474,9 +633,86 @@ class DynamoDBStorage:
         except Exception as e:
             logger.warning(f"Failed to increment span_count for trace {span.trace_id}: {e}")
 
+        # Tokens/cost are usually reported at completion; count anything
+        # already present here (spans saved pre-populated are never
+        # re-reported by complete_span in the client flow)
+        if project_id:
+            await self._bump_stats(
+                project_id,
+                spans=1,
+                tokens=(span.tokens_input or 0) + (span.tokens_output or 0),
+                cost=span.cost_usd or 0.0,
+            )
+
         logger.debug(f"Saved span: {span_dict['span_id']}")
         return span_dict['span_id']
 
+    async def save_spans_batch(
+        self, spans: List[Span], project_id: Optional[str] = None
+    ) -> List[str]:
+        """Save multiple spans with BatchWriteItem instead of per-span puts.
+
+        `batch_writer` coalesces the puts into BatchWriteItem calls of up
+        to 25 items and retries unprocessed items, so a large batch costs
+        a handful of round-trips instead of one per span. The span_count
+        denormalization is likewise bumped once per parent trace rather
+        than once per span.
+
+        Parameters
+        ----------
+        spans : List[Span]
+            The Span model objects to save.
+        project_id : Optional[str]
+            Owning project, for the materialized stats counters; one
+            increment covers the whole batch.
+
+        Returns
+        -------
+        List[str]
+            The span IDs, in input order.
+        """
+        # Datetimes are tz-aware by model validation; no per-span re-check.
+        # One shared expiry for the whole batch instead of a clock read
+        # per span.
+        ttl = int(time.time()) + TTL_SECONDS
+        items = [self._add_ttl(span.to_dynamodb_item(), ttl=ttl) for span in spans]
+
+        def _write_batch():
+            with self.spans_table.batch_writer() as batch:
+                for item in items:
+                    batch.put_item(Item=item)
+
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(None, _write_batch)
+
+        # One span_count increment per parent trace (denormalization)
+        counts = {}
+        for span in spans:
+            counts[span.trace_id] = counts.get(span.trace_id, 0) + 1
+        for trace_id, count in counts.items():
+            try:
+                await asyncio.to_thread(
+                    self.traces_table.update_item,
+                    Key={"trace_id": trace_id},
+                    UpdateExpression="ADD span_count :inc",
+                    ExpressionAttributeValues={":inc": count}
+                )
+            except Exception as e:
+                logger.warning(f"Failed to increment span_count for trace {trace_id}: {e}")
+
+        if project_id and spans:
+            await self._bump_stats(
+                project_id,
+                spans=len(spans),
+                tokens=sum(
+                    (s.tokens_input or 0) + (s.tokens_output or 0) for s in spans
+                ),
+                cost=sum(s.cost_usd or 0.0 for s in spans),
+            )
+
+        logger.debug(f"Saved {len(items)} spans in batch")
+        return [item['span_id'] for item in items]
+
     async def get_span(self, span_id: str) -> Optional[Dict]:
         """Get a span by ID
         
@@ -491,7 +727,9 @@ class DynamoDBStorage:
             The span data dictionary if found, None otherwise.
         """
         try:
-            response = self.spans_table.get_item(Key={"span_id": span_id})
+            response = await asyncio.to_thread(
+                self.spans_table.get_item, Key={"span_id": span_id}
+            )
             item = response.get("Item")
             if item:
                 # Remove TTL field from response (internal field)
@@ -530,7 +768,8 @@ class DynamoDBStorage:
                     return []
             
             # Query using trace-index GSI
-            response = self.spans_table.query(
+            response = await asyncio.to_thread(
+                self.spans_table.query,
                 IndexName="trace-index",
                 KeyConditionExpression=Key("trace_id").eq(trace_id)
             )
@@ -556,6 +795,9 @@ class DynamoDBStorage:
         tokens_input: Optional[int] = None,
         tokens_output: Optional[int] = None,
         cost_usd: Optional[float] = None,
+        trace_id: Optional[str] = None,
+        start_time: Optional[datetime | str] = None,
+        project_id: Optional[str] = None,
     ) -> bool:
         """Update a span.
 
@@ -575,6 +817,16 @@ class DynamoDBStorage:
             The number of output tokens.
         cost_usd : Optional[float]
             The cost of the span in USD.
+        trace_id : Optional[str]
+            Parent trace ID, if the caller already has it. Used for the
+            total_cost denormalization without re-reading the span.
+        start_time : Optional[datetime | str]
+            Span start, if the caller already has it. Skips the extra
+            read round-trip needed to compute duration_ms; when None it
+            is fetched here.
+        project_id : Optional[str]
+            Owning project, for the materialized stats counters; tokens
+            and cost reported here are added to the project totals.
 
         Returns
         -------
@@ -586,20 +838,26 @@ class DynamoDBStorage:
         end_time = self._validate_datetime(end_time, "end_time")
 
         try:
-            # Get current span to calculate duration
-            response = self.spans_table.get_item(Key={"span_id": span_id})
-            span = response.get("Item")
+            # Fetch start_time/trace_id only if the caller couldn't supply them
+            if start_time is None:
+                response = await asyncio.to_thread(
+                    self.spans_table.get_item,
+                    Key={"span_id": span_id},
+                    ProjectionExpression="start_time, trace_id",
+                )
+                span = response.get("Item")
 
-            if not span:
-                logger.error(f"Span {span_id} not found")
-                return False
+                if not span:
+                    logger.error(f"Span {span_id} not found")
+                    return False
 
-            # calculate duration
-            start_time_str = span["start_time"]
-            if start_time_str.endswith("Z"):
-                start_time_str = start_time_str.replace("Z", "+00:00")
+                start_time = span["start_time"]
+                if trace_id is None:
+                    trace_id = span.get("trace_id")
 
-            start_time = datetime.fromisoformat(start_time_str)
+            # calculate duration
+            if isinstance(start_time, str):
+                start_time = datetime.fromisoformat(start_time)
             duration_ms = int((end_time - start_time).total_seconds() * 1000)
 
 
@@ -638,20 +896,23 @@ class DynamoDBStorage:
             kwargs = {
                 "Key": {"span_id": span_id},
                 "UpdateExpression": update_expr,
+                # Stops the fast path (start_time passed in, no read
+                # above) from upserting a missing span
+                "ConditionExpression": "attribute_exists(span_id)",
                 "ExpressionAttributeValues": expr_attr_values,
             }
 
             if expr_attr_names:
                 kwargs["ExpressionAttributeNames"] = expr_attr_names
 
-            self.spans_table.update_item(**kwargs)
+            await asyncio.to_thread(self.spans_table.update_item, **kwargs)
 
             # If cost was provided, atomically add it to trace's total_cost (denormalization)
             if cost_usd is not None and cost_usd > 0:
-                trace_id = span.get("trace_id")
                 if trace_id:
                     try:
-                        self.traces_table.update_item(
+                        await asyncio.to_thread(
+                            self.traces_table.update_item,
                             Key={"trace_id": trace_id},
                             UpdateExpression="ADD total_cost :cost",
                             ExpressionAttributeValues={":cost": Decimal(str(cost_usd))}
@@ -659,49 +920,158 @@ class DynamoDBStorage:
                     except Exception as e:
                         logger.warning(f"Failed to update total_cost for trace {trace_id}: {e}")
 
+            # Fold completion-time tokens/cost into the project counters
+            if project_id and (tokens_input or tokens_output or cost_usd):
+                await self._bump_stats(
+                    project_id,
+                    tokens=(tokens_input or 0) + (tokens_output or 0),
+                    cost=cost_usd or 0.0,
+                )
+
             logger.debug(f"Completed span: {span_id} (duration: {duration_ms} ms)")
             return True
 
         except ClientError as e:
-            logger.error(f"Error completing span {span_id}: {e}")
+            if e.response["Error"]["Code"] == "ConditionalCheckFailedException":
+                logger.error(f"Span {span_id} not found")
+            else:
+                logger.error(f"Error completing span {span_id}: {e}")
             return False
     
-    async def get_stats(self, project_id: str) -> Dict:
-        """Get stats for a project."""
+    async def get_stats_fingerprint(self, project_id: str) -> str:
+        """Cheap change indicator for a project's stats, for ETag checks.
+
+        Reads the materialized counters item — the ground truth
+        get_stats serves from, bumped by span writes and completions on
+        ANY trace — alongside the newest trace's projected GSI row. The
+        newest-trace row alone is not enough: a span completed on an
+        older trace changes the counters (and thus the stats body)
+        without touching the newest trace, which would leave cached
+        ETags validating stale stats forever. Two light concurrent
+        reads, still far cheaper than the full get_stats fan-out.
+
+        Returns
+        -------
+        str
+            A string that changes whenever the counters item or the
+            newest trace changes; empty string if the check itself
+            failed (callers should then skip caching).
+        """
         try:
-            # Query traces for project (count only)
-            traces_response = self.traces_table.query(
-                IndexName="project-time-index",
-                KeyConditionExpression=Key("project_id").eq(project_id),
-                Select="COUNT",
+            counters_resp, latest_resp = await asyncio.gather(
+                asyncio.to_thread(
+                    self.traces_table.get_item,
+                    Key=self._stats_key(project_id),
+                    ProjectionExpression=(
+                        "total_traces, total_spans, total_tokens, total_cost"
+                    ),
+                ),
+                asyncio.to_thread(
+                    self.traces_table.query,
+                    IndexName="project-time-index",
+                    KeyConditionExpression=Key("project_id").eq(project_id),
+                    ScanIndexForward=False,
+                    Limit=1,
+                    ProjectionExpression="start_time, end_time, span_count, total_cost",
+                ),
+            )
+            counters = counters_resp.get("Item") or {}
+            items = latest_resp.get("Items")
+            if not items and not counters:
+                return "empty"
+            latest = items[0] if items else {}
+            return (
+                f"{latest.get('start_time')}|{latest.get('end_time')}|"
+                f"{latest.get('span_count')}|{latest.get('total_cost')}|"
+                f"{counters.get('total_traces')}|{counters.get('total_spans')}|"
+                f"{counters.get('total_tokens')}|{counters.get('total_cost')}"
             )
-            total_traces = traces_response.get("Count", 0)
 
-            # Get recent traces to calculate span stats
-            query = TraceQuery(project_id=project_id, limit=50)
-            recent_result = await self.get_traces(query)
-            recent_traces = recent_result.get("items", [])
+        except ClientError as e:
+            logger.error(f"Error fingerprinting stats for project {project_id}: {e}")
+            return ""
 
-            total_spans = 0
-            total_tokens = 0
-            total_cost = 0.0
+    def _stats_key(self, project_id: str) -> Dict:
+        """Key of the materialized per-project stats item.
 
-            for trace in recent_traces:
-                spans = await self.get_spans(trace["trace_id"])
-                total_spans += len(spans)
+        Lives in the traces table; it carries no project_id/start_time
+        attributes, so the sparse project-time-index never surfaces it.
+        """
+        return {"trace_id": f"stats#{project_id}"}
 
-                for span in spans:
-                    total_tokens += (span.get("tokens_input") or 0) + (span.get("tokens_output") or 0)
-                    cost = span.get("cost_usd")
-                    if cost:
-                        total_cost += float(cost)
+    async def _bump_stats(
+        self,
+        project_id: str,
+        traces: int = 0,
+        spans: int = 0,
+        tokens: int = 0,
+        cost: float = 0.0,
+    ) -> None:
+        """Increment the materialized stats counters for a project.
+
+        Best-effort like the other denormalizations: a failed bump is
+        logged and swallowed so it never fails the write that caused it.
+        """
+        try:
+            await asyncio.to_thread(
+                self.traces_table.update_item,
+                Key=self._stats_key(project_id),
+                UpdateExpression=(
+                    "ADD total_traces :tr, total_spans :s, "
+                    "total_tokens :t, total_cost :c"
+                ),
+                ExpressionAttributeValues={
+                    ":tr": traces,
+                    ":s": spans,
+                    ":t": tokens,
+                    ":c": Decimal(str(cost)),
+                },
+            )
+        except Exception as e:
+            logger.warning(f"Failed to update stats counters for project {project_id}: {e}")
 
-            return {
-                "total_traces": total_traces,
-                "total_spans": total_spans,
-                "total_tokens": total_tokens,
-                "total_cost": round(total_cost, 4),
-            }
+    async def get_stats(self, project_id: str) -> Dict:
+        """Get stats for a project.
+
+        Reads the materialized counters item — a single O(1) get_item —
+        maintained by the write paths. Projects that predate the counters
+        are aggregated the old way once, and the result is seeded back so
+        subsequent reads take the fast path.
+        """
+        try:
+            response = await asyncio.to_thread(
+                self.traces_table.get_item, Key=self._stats_key(project_id)
+            )
+            item = response.get("Item")
+            if item:
+                return {
+                    "total_traces": int(item.get("total_traces") or 0),
+                    "total_spans": int(item.get("total_spans") or 0),
+                    "total_tokens": int(item.get("total_tokens") or 0),
+                    "total_cost": round(float(item.get("total_cost") or 0), 4),
+                }
+
+            stats = await self._aggregate_stats(project_id)
+
+            # Seed the counters so later reads skip the aggregation; the
+            # condition keeps a concurrent writer's increments from being
+            # clobbered (we just lose the race and keep their item)
+            try:
+                await asyncio.to_thread(
+                    self.traces_table.put_item,
+                    Item={
+                        **self._stats_key(project_id),
+                        "total_traces": stats["total_traces"],
+                        "total_spans": stats["total_spans"],
+                        "total_tokens": stats["total_tokens"],
+                        "total_cost": Decimal(str(stats["total_cost"])),
+                    },
+                    ConditionExpression="attribute_not_exists(trace_id)",
+                )
+            except ClientError:
+                pass
+
+            return stats
 
         except ClientError as e:
             logger.error(f"Error getting stats for project {project_id}: {e}")
@@ -711,3 +1081,79 @@ class DynamoDBStorage:
                 "total_tokens": 0,
                 "total_cost": 0.0,
             }
+
+    async def _aggregate_stats(self, project_id: str) -> Dict:
+        """Aggregate stats by scanning recent traces and their spans.
+
+        Fallback for projects without a stats item; O(traces × spans)
+        reads, so only ever paid once per project. A sparse project_id
+        GSI on the spans table would collapse this to one paginated
+        query, but span items don't carry project_id and adding the
+        attribute plus index is a Terraform/backfill change that isn't
+        worth it for a once-per-project path.
+        """
+        # Query traces for project (count only). Even COUNT queries stop
+        # at the 1MB evaluation boundary, so page on LastEvaluatedKey —
+        # no item bytes are transferred, only the per-page integer.
+        total_traces = 0
+        count_kwargs = {
+            "IndexName": "project-time-index",
+            "KeyConditionExpression": Key("project_id").eq(project_id),
+            "Select": "COUNT",
+        }
+        while True:
+            traces_response = await asyncio.to_thread(
+                self.traces_table.query, **count_kwargs
+            )
+            total_traces += traces_response.get("Count", 0)
+            last_key = traces_response.get("LastEvaluatedKey")
+            if not last_key:
+                break
+            count_kwargs["ExclusiveStartKey"] = last_key
+
+        # Get recent traces to calculate span stats
+        query = TraceQuery(project_id=project_id, limit=50)
+        recent_result = await self.get_traces(query)
+        recent_traces = recent_result.get("items", [])
+
+        total_spans = 0
+        total_tokens = 0
+        # DynamoDB returns cost_usd as Decimal; summing in Decimal skips
+        # a float conversion per span and avoids drift across thousands
+        # of tiny costs
+        total_cost = Decimal(0)
+
+        # Fan the per-trace span queries out concurrently instead of
+        # serially awaiting up to 50 round trips; boto3 is sync, so
+        # each query runs in the bounded stats pool. The projection
+        # fetches only the three aggregated attributes rather than
+        # full span payloads.
+        def _query_span_stats(trace_id: str):
+            return self.spans_table.query(
+                IndexName="trace-index",
+                KeyConditionExpression=Key("trace_id").eq(trace_id),
+                ProjectionExpression="tokens_input, tokens_output, cost_usd",
+            )
+
+        loop = asyncio.get_running_loop()
+        responses = await asyncio.gather(*[
+            loop.run_in_executor(self._stats_pool, _query_span_stats, trace["trace_id"])
+            for trace in recent_traces
+        ])
+
+        for response in responses:
+            spans = response.get("Items", [])
+            total_spans += len(spans)
+
+            for span in spans:
+                total_tokens += int(span.get("tokens_input") or 0) + int(span.get("tokens_output") or 0)
+                cost = span.get("cost_usd")
+                if cost:
+                    total_cost += cost
+
+        return {
+            "total_traces": total_traces,
+            "total_spans": total_spans,
+            "total_tokens": total_tokens,
+            "total_cost": float(total_cost.quantize(Decimal("0.0001"))),
+        }
@@ -2,78 +2,336 @@
 
 import pytest
 import os
+import sys
+from unittest.mock import MagicMock
+
 import boto3
+from botocore.stub import Stubber
 from moto import mock_aws
 from datetime import datetime, UTC
+from types import MappingProxyType
 
 from service.scripts.dynamodb_schemas import (
     get_create_table_kwargs,
     TRACES_SCHEMA,
     SPANS_SCHEMA,
 )
+from service.src.storage_dynamodb import DynamoDBStorage
+
+# Test runs shouldn't litter __pycache__ under tests/; the env var
+# equivalent would be too late here, the interpreter is already up
+sys.dont_write_bytecode = True
 
 # Default region for tests (can be overridden via AWS_REGION env var)
 TEST_AWS_REGION = os.getenv("AWS_REGION", "eu-central-1")
 
+# Per-worker table names so `pytest -n auto` workers don't collide when
+# they share one DynamoDB Local endpoint (under moto each worker process
+# has its own in-memory backend, where the suffix is just harmless).
+# Mirrors the namespacing the integration conftest does for the server's
+# tables.
+_XDIST_WORKER = os.environ.get("PYTEST_XDIST_WORKER", "")
+TEST_TRACES_TABLE = f"test-traces-{_XDIST_WORKER}" if _XDIST_WORKER else "test-traces"
+TEST_SPANS_TABLE = f"test-spans-{_XDIST_WORKER}" if _XDIST_WORKER else "test-spans"
+
+# Opt-in for running the unit fixtures against DynamoDB Local. This is
+# deliberately NOT the generic DYNAMODB_ENDPOINT_URL: that variable is
+# owned by the server under test (the integration conftest exports it
+# for the app's storage singleton, and developers running
+# docker-compose often have it in their shell), and honoring it here
+# would silently point every unit-test boto3 client at a possibly
+# absent local server instead of moto.
+UNIT_DYNAMODB_ENDPOINT = os.environ.get("UNIT_DYNAMODB_ENDPOINT_URL")
+
+
+def pytest_collection_modifyitems(config, items):
+    """Run the fast unit tests before the integration/deployment ones.
+
+    Alphabetical collection would start with the slow directories; with
+    unit first, a broken change fails within the first second of a full
+    run instead of after the integration round-trips.
+    """
+    items.sort(key=lambda item: 0 if "/unit/" in str(item.fspath) else 1)
+
 
 @pytest.fixture(scope="session")
 def aws_credentials():
-    """Mosck AWS credentials for testing"""
+    """Mocked AWS credentials for testing.
+
+    Deliberately NOT autouse: only the moto/Local-backed fixtures pull
+    this in. The deployment suite builds plain boto3 clients against the
+    live tables and needs the caller's real ambient credentials —
+    autouse here would overwrite them with "testing" for every run
+    under tests/ and fail deployment verification against a perfectly
+    healthy stack.
+    """
     os.environ["AWS_ACCESS_KEY_ID"] = "testing"
     os.environ["AWS_SECRET_ACCESS_KEY"] = "testing"
     os.environ["AWS_SECURITY_TOKEN"] = "testing"
     os.environ["AWS_SESSION_TOKEN"] = "testing"
     os.environ["AWS_DEFAULT_REGION"] = TEST_AWS_REGION
+    # Fail fast in tests: the default adaptive retries turn any
+    # misconfigured endpoint into a multi-second timeout cascade
+    os.environ["AWS_MAX_ATTEMPTS"] = "1"
+    os.environ["AWS_RETRY_MODE"] = "standard"
+    # DynamoDBStorage falls back to this env var for its endpoint, so a
+    # leaked value (exported shell, or the integration conftest's setup
+    # for the server under test) would redirect the unit fixtures away
+    # from moto. Drop it before any client is built; Local runs use the
+    # dedicated UNIT_DYNAMODB_ENDPOINT_URL opt-in instead.
+    os.environ.pop("DYNAMODB_ENDPOINT_URL", None)
 
 
-@pytest.fixture
-def dynamodb_tables(aws_credentials, monkeypatch):
-    """Create mock DynamoDB tables"""
-    monkeypatch.delenv("DYNAMODB_ENDPOINT_URL", raising=False)
+def _get_or_create_tables(dynamodb):
+    """Create the two test tables, reusing any that already exist."""
+    tables = {}
+    for alias, name, schema in (
+        ("traces", TEST_TRACES_TABLE, TRACES_SCHEMA),
+        ("spans", TEST_SPANS_TABLE, SPANS_SCHEMA),
+    ):
+        try:
+            table = dynamodb.create_table(**get_create_table_kwargs(name, schema))
+            table.wait_until_exists()
+        except dynamodb.meta.client.exceptions.ResourceInUseException:
+            # Left over from a previous session against DynamoDB Local;
+            # dynamodb_tables empties it before each test anyway
+            table = dynamodb.Table(name)
+        tables[alias] = table
+    return tables
+
+
+@pytest.fixture(scope="session")
+def boto_session(aws_credentials):
+    """One boto3 session shared by every storage instance in the run.
+
+    Each DynamoDBStorage built on the default session re-resolves the
+    credential chain and sets up its own HTTP pool; sharing a session
+    pays that once. Individual resource() calls still get their own
+    client, so the Stubber-based fixtures stay isolated from each other.
+
+    Also prewarms botocore's lazy DynamoDB service-model parse (the
+    large service-2.json) so the first storage test doesn't pay it
+    inside its own timing — same rationale as _warm_models. Not an
+    autouse fixture: that would drag the mocked aws_credentials into
+    deployment runs, which need real ambient credentials.
+    """
+    session = boto3.session.Session()
+    client = session.client("dynamodb", region_name=TEST_AWS_REGION)
+    client.meta.service_model.operation_model("GetItem")
+    return session
+
+
+@pytest.fixture(scope="session")
+def _dynamodb_mock_tables(aws_credentials):
+    """Session-scoped DynamoDB backend with the two tables created once.
+
+    Entering mock_aws() and creating tables is by far the slowest part
+    of each moto-backed test, so it happens once per session; the
+    function-scoped `dynamodb_tables` below empties the tables between
+    tests instead of recreating them.
+
+    If UNIT_DYNAMODB_ENDPOINT_URL is set (e.g. the amazon/dynamodb-local
+    container from docker-compose.yml on :8000), tables are created
+    there instead of under moto: the native Java server skips moto's
+    per-call Python dispatch entirely.
+    """
+    if UNIT_DYNAMODB_ENDPOINT:
+        dynamodb = boto3.resource(
+            "dynamodb",
+            region_name=TEST_AWS_REGION,
+            endpoint_url=UNIT_DYNAMODB_ENDPOINT,
+        )
+        yield _get_or_create_tables(dynamodb)
+        return
 
+    # mock_aws is the only entry point since moto 5 (the per-service
+    # mock_dynamodb decorator was removed); moto loads service backends
+    # lazily on first use, so only the DynamoDB one is actually built,
+    # and the context is entered once per session anyway.
     with mock_aws():
         dynamodb = boto3.resource("dynamodb", region_name=TEST_AWS_REGION)
+        yield _get_or_create_tables(dynamodb)
 
-        # Create traces table
-        traces_table = dynamodb.create_table(
-            **get_create_table_kwargs("test-traces", TRACES_SCHEMA)
-        )
 
-        # Create spans table
-        spans_table = dynamodb.create_table(
-            **get_create_table_kwargs("test-spans", SPANS_SCHEMA)
-        )
+def _clear_table(table, key_name: str) -> None:
+    """Delete every item from a table (key-only scan + batched deletes)."""
+    scan_kwargs = {"ProjectionExpression": key_name}
+    with table.batch_writer() as batch:
+        while True:
+            response = table.scan(**scan_kwargs)
+            for item in response["Items"]:
+                batch.delete_item(Key={key_name: item[key_name]})
+            last_key = response.get("LastEvaluatedKey")
+            if not last_key:
+                return
+            scan_kwargs["ExclusiveStartKey"] = last_key
+
+
+@pytest.fixture
+def dynamodb_tables(_dynamodb_mock_tables):
+    """Mock DynamoDB tables, emptied before each test"""
+    _clear_table(_dynamodb_mock_tables["traces"], "trace_id")
+    _clear_table(_dynamodb_mock_tables["spans"], "span_id")
+    return _dynamodb_mock_tables
+
+
+@pytest.fixture(scope="session")
+def storage(_dynamodb_mock_tables, boto_session):
+    """One DynamoDBStorage for the whole run.
+
+    Building the boto3 resource (botocore model load, client, session)
+    is the expensive part of each storage test, and the instance holds
+    no per-test state — the tables it points at are what gets cleared
+    between tests, via `dynamodb_tables`. Depends on the session backend
+    fixture so the client is constructed under the active mock.
+    """
+    return DynamoDBStorage(
+        traces_table_name=TEST_TRACES_TABLE,
+        spans_table_name=TEST_SPANS_TABLE,
+        endpoint_url=UNIT_DYNAMODB_ENDPOINT,
+        session=boto_session,
+    )
+
+
+@pytest.fixture
+def mock_storage(boto_session):
+    """DynamoDBStorage with both tables swapped for MagicMocks.
 
-        yield {
-            "traces": traces_table,
-            "spans": spans_table,
-        }
+    For error-path tests that only check how a raising boto3 call is
+    handled: the failing call is injected with patch.object, any reads
+    on the happy path before it are configured via return_value, and no
+    backend (moto or DynamoDB Local) is touched at all.
+    """
+    storage = DynamoDBStorage(
+        traces_table_name="test-traces",
+        spans_table_name="test-spans",
+        session=boto_session,
+    )
+    storage.traces_table = MagicMock()
+    storage.spans_table = MagicMock()
+    return storage
 
 
 @pytest.fixture
+def stubbed_storage(boto_session):
+    """DynamoDBStorage with its client wrapped in a botocore Stubber.
+
+    For tests that only check the shape of the request a storage method
+    makes (right table, right expression), the stubber short-circuits at
+    the client level — no moto emulation, no tables to create or clear.
+    Queue responses with stubber.add_response(); expected_params use
+    plain Python values (the stubber compares before the resource layer
+    serializes to DynamoDB wire format). Both tables share the
+    resource's client, so one stubber covers them.
+
+    Tests that need real query/filter semantics belong on
+    dynamodb_tables instead.
+    """
+    storage = DynamoDBStorage(
+        traces_table_name="test-traces",
+        spans_table_name="test-spans",
+        session=boto_session,
+    )
+    stubber = Stubber(storage.traces_table.meta.client)
+    stubber.activate()
+    yield storage, stubber
+    stubber.assert_no_pending_responses()
+    stubber.deactivate()
+
+
+@pytest.fixture(scope="session", autouse=True)
+def _warm_models():
+    """Force pydantic schema builds once at session start.
+
+    Otherwise each model's first instantiation pays the lazy build
+    inside whichever test happens to run first, skewing its timing.
+    """
+    from service.src.models import Trace, Span, TraceCreate, SpanCreate
+
+    for model in (Trace, Span, TraceCreate, SpanCreate):
+        model.model_json_schema()
+
+
+def raise_async(exc: Exception):
+    """Return an async callable that raises exc when awaited.
+
+    For monkeypatching storage methods in failure-path tests without
+    redefining a one-off coroutine function per test.
+    """
+    async def _raiser(*args, **kwargs):
+        raise exc
+
+    return _raiser
+
+
+# Frozen clock for test data: no wall-clock reads in test bodies, and
+# the items the storage layer writes are identical run to run — a
+# prerequisite for comparing payloads byte-for-byte. END is a minute
+# after START so computed durations stay positive; nothing asserts on
+# the actual values.
+FROZEN_START = datetime(2025, 1, 15, 10, 30, tzinfo=UTC)
+FROZEN_END = datetime(2025, 1, 15, 10, 31, tzinfo=UTC)
+
+
+def _session_ts() -> str:
+    """Start timestamp used by the sample data (frozen, see above)."""
+    return FROZEN_START.isoformat()
+
+
+@pytest.fixture(scope="session")
+def frozen_end():
+    """Deterministic completion timestamp paired with the sample start."""
+    return FROZEN_END
+
+
+# Read-only data builders: session-scoped so the timestamp and dict are
+# built once. Tests that need a variant already spread into a new dict
+# ({**sample_trace, ...}); MappingProxyType catches accidental mutation.
+@pytest.fixture(scope="session")
 def sample_trace():
-    """Sample trace data for testing"""
-    return {
+    """Sample trace data for testing (read-only)"""
+    return MappingProxyType({
         "trace_id": "test-trace-123",
         "name": "Test Trace",
         "project_id": "test-project",
-        "start_time": datetime.now(UTC).isoformat(),
+        "start_time": _session_ts(),
         "tags": ["test", "sample"],
         "metadata": {"key": "value"},
-    }
+    })
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
+def trace_obj(sample_trace):
+    """Pre-validated Trace built from sample_trace (treat as read-only).
+
+    Pydantic validation runs once per session instead of once per test;
+    tests needing a variant use trace_obj.model_copy(update={...}),
+    which skips re-validation.
+    """
+    from service.src.models import Trace
+
+    return Trace(**sample_trace)
+
+
+@pytest.fixture(scope="session")
+def span_obj(sample_span):
+    """Pre-validated open Span built from sample_span (treat as read-only)."""
+    from service.src.models import Span
+
+    return Span(**sample_span, end_time=None, duration_ms=None)
+
+
+@pytest.fixture(scope="session")
 def sample_span():
-    """Sample span data for testing"""
-    return {
+    """Sample span data for testing (read-only)"""
+    return MappingProxyType({
         "span_id": "test-span-123",
         "trace_id": "test-trace-123",
         "name": "Test Span",
         "span_type": "llm",
-        "start_time": datetime.now(UTC).isoformat(),
+        "start_time": _session_ts(),
         "model": "gpt-4",
         "tokens_input": 100,
         "tokens_output": 50,
         "cost_usd": 0.002,
-    }
\ No newline at end of file
+    })
\ No newline at end of file
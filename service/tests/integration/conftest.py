@@ -0,0 +1,124 @@
+"""Shared setup for integration tests against DynamoDB Local.
+
+The env vars must be set before any test module imports
+service.src.server (it reads them at import time to build the storage
+singleton). Doing it here instead of per test module makes the setup
+order-independent: pytest always loads this conftest before collecting
+the modules in this directory, so whichever module imports the app
+first gets the same configuration.
+
+Under pytest-xdist each worker gets its own pair of tables so tests can
+run with -n auto without cross-worker interference; without xdist the
+names are unchanged.
+"""
+
+import os
+import socket
+from pathlib import Path
+
+import pytest
+import boto3
+from fastapi.testclient import TestClient
+
+_worker = os.environ.get("PYTEST_XDIST_WORKER")
+_suffix = f"-{_worker}" if _worker else ""
+# Captured as constants because the parent conftest scrubs
+# DYNAMODB_ENDPOINT_URL from the environment before the first test runs
+# (the unit fixtures must never inherit it); the server singleton and
+# the fixtures below both read these instead of re-reading os.environ.
+_ENDPOINT_URL = "http://localhost:8000"
+_TRACES_TABLE = f"llm-tracer-dev-traces{_suffix}"
+_SPANS_TABLE = f"llm-tracer-dev-spans{_suffix}"
+os.environ["DYNAMODB_ENDPOINT_URL"] = _ENDPOINT_URL
+os.environ["DYNAMODB_TRACES_TABLE"] = _TRACES_TABLE
+os.environ["DYNAMODB_SPANS_TABLE"] = _SPANS_TABLE
+os.environ["API_KEY_REQUIRED"] = "true"
+os.environ["API_KEYS"] = "project-test"
+
+from service.scripts.dynamodb_schemas import (  # noqa: E402
+    get_create_table_kwargs,
+    TRACES_SCHEMA,
+    SPANS_SCHEMA,
+)
+
+# Import the app exactly here, right after the env setup above: server.py
+# builds its storage singleton at import time, and FastAPI + pydantic +
+# boto3 import cost is paid once per process this way. Test modules take
+# it via the `app` fixture instead of importing server themselves.
+from service.src.server import app as _app  # noqa: E402
+
+
+@pytest.fixture(scope="session")
+def app():
+    """The FastAPI app, imported once with the env configured above."""
+    return _app
+
+
+@pytest.fixture(scope="session")
+def client(app):
+    """FastAPI test client, shared across the whole integration run.
+
+    Constructing a TestClient spins up an httpx client, ASGI transport
+    and lifespan per instantiation; one shared instance drops that to a
+    single startup. Storage is a module-level singleton in server.py, so
+    there is no per-test app state a fresh client would reset anyway.
+    """
+    # This allows testing against the client w/o starting a real HTTP server
+    with TestClient(app) as c:
+        yield c
+
+
+@pytest.fixture(scope="session")
+def auth_headers():
+    """Authentication headers matching project_id 'test'."""
+    return {"X-API-Key": "project-test"}
+
+# Probe once at conftest load. Letting boto3 discover a dead endpoint
+# costs a connect retry/timeout cascade per test; a 200ms socket check
+# turns that into an immediate skip for the whole directory.
+try:
+    socket.create_connection(("localhost", 8000), timeout=0.2).close()
+    _LOCAL_RUNNING = True
+except OSError:
+    _LOCAL_RUNNING = False
+
+_THIS_DIR = Path(__file__).parent
+
+
+def pytest_collection_modifyitems(items):
+    if _LOCAL_RUNNING:
+        return
+    skip = pytest.mark.skip(reason="DynamoDB Local not running on localhost:8000")
+    for item in items:
+        if Path(item.fspath).parent == _THIS_DIR:
+            item.add_marker(skip)
+
+
+@pytest.fixture(scope="session", autouse=True)
+def _worker_tables(aws_credentials):
+    """Create this worker's tables in DynamoDB Local if they're missing.
+
+    With the per-worker table names above this makes `pytest -n auto`
+    safe; without xdist it just creates the default tables on first run.
+    Depends on aws_credentials (no longer autouse, deployment runs need
+    real credentials) — DynamoDB Local still wants dummy ones to sign
+    with, and the app's storage singleton resolves them lazily from the
+    same env before the first request.
+    """
+    dynamodb = boto3.resource(
+        "dynamodb",
+        region_name=os.environ.get("AWS_REGION", "eu-central-1"),
+        endpoint_url=_ENDPOINT_URL,
+    )
+    tables = {}
+    for alias, name, schema in (
+        ("traces", _TRACES_TABLE, TRACES_SCHEMA),
+        ("spans", _SPANS_TABLE, SPANS_SCHEMA),
+    ):
+        try:
+            table = dynamodb.create_table(**get_create_table_kwargs(name, schema))
+            table.wait_until_exists()
+        except dynamodb.meta.client.exceptions.ResourceInUseException:
+            table = dynamodb.Table(name)
+        tables[alias] = table
+    return tables
@@ -0,0 +1,44 @@
+"""Small helpers for driving the API in integration tests.
+
+Each helper issues one request, asserts success, and returns just what
+the caller needs, so workflow tests read as a spec of steps instead of
+repeated post/patch + json() boilerplate.
+"""
+
+
+def make_trace(client, headers, **kwargs) -> str:
+    """POST a trace and return its id. kwargs override the defaults."""
+    payload = {"name": "Test trace", "project_id": "test", **kwargs}
+    response = client.post("/api/traces", json=payload, headers=headers)
+    assert response.status_code == 200, response.text
+    return response.json()["trace_id"]
+
+
+def make_span(client, headers, trace_id, **kwargs) -> str:
+    """POST a span onto a trace and return its id."""
+    payload = {"name": "Test span", "span_type": "llm", **kwargs}
+    response = client.post(
+        f"/api/traces/{trace_id}/spans", json=payload, headers=headers
+    )
+    assert response.status_code == 200, response.text
+    return response.json()["span_id"]
+
+
+def complete_span(client, headers, span_id, **kwargs):
+    """PATCH a span complete with the given completion fields."""
+    response = client.patch(
+        f"/api/spans/{span_id}/complete", json=kwargs, headers=headers
+    )
+    assert response.status_code == 200, response.text
+    return response
+
+
+def complete_trace(client, headers, trace_id, output=None):
+    """PATCH a trace complete."""
+    response = client.patch(
+        f"/api/traces/{trace_id}/complete",
+        json={"output": output} if output is not None else {},
+        headers=headers,
+    )
+    assert response.status_code == 200, response.text
+    return response
@@ -9,36 +9,19 @@ Execute this file from service/ for async tests to pass
 # making 'service' importable as a package. Run tests from service/ directory with: uv run pytest
 """
 
-import pytest
-import time
-import os
-from fastapi.testclient import TestClient
-
-# Configure for DynamoDB Local / this is needed even when Using TestClient as:
-# TestClient -> FastAPI app -> DynamoDBStorage -> DynamoDB Local (localhost:8000)
-os.environ["DYNAMODB_ENDPOINT_URL"] = "http://localhost:8000"
-os.environ["DYNAMODB_TRACES_TABLE"] = "llm-tracer-dev-traces"
-os.environ["DYNAMODB_SPANS_TABLE"] = "llm-tracer-dev-spans"
-
-# Configure auth for tests
-os.environ["API_KEY_REQUIRED"] = "true"
-os.environ["API_KEYS"] = "project-test"
-
-# This must be imported after because server.py loads .env and it has defaults that DynamoDBStorage uses to initialize.
-# Which we don't want. We want it to use os.environ vars as defined above - especially the api_keys and table names.
-from service.src.server import app
-
-
-@pytest.fixture
-def client():
-    """FastAPI test client."""
-    return TestClient(app)
+import asyncio
 
+import httpx
+import pytest
 
-@pytest.fixture
-def auth_headers():
-    """Authentication headers matching project_id 'test'."""
-    return {"X-API-Key": "project-test"}
+# Env setup for DynamoDB Local plus the shared session-scoped `client`
+# and `auth_headers` fixtures live in this directory's conftest.py.
+from service.tests.integration.helpers import (
+    make_trace,
+    make_span,
+    complete_span,
+    complete_trace,
+)
 
 
 class TestLLMCallWorkflow:
@@ -47,61 +30,43 @@ class TestLLMCallWorkflow:
     def test_complete_llm_call_workflow(self, client, auth_headers):
         """Full workflow: create trace, add span, complete both, verify results."""
         # Step 1: Create trace for LLM call
-        trace_response = client.post(
-            "/api/traces",
-            json={
-                "name": "LLM Call Workflow Test",
-                "project_id": "test",  # this must match with auth_headers containing API_KEYS; which should be 'project-test'
-                "metadata": {"model": "gpt-4", "temperature": 0.7},
-                "tags": ["workflow-test", "llm"],
-            },
-            headers=auth_headers,
+        # (project_id must match auth_headers containing API_KEYS; which should be 'project-test')
+        trace_id = make_trace(
+            client,
+            auth_headers,
+            name="LLM Call Workflow Test",
+            metadata={"model": "gpt-4", "temperature": 0.7},
+            tags=["workflow-test", "llm"],
         )
 
-        assert trace_response.status_code == 200
-        trace_id = trace_response.json()["trace_id"]
-
         # Step 2: Create LLM span
-        span_response = client.post(
-            f"/api/traces/{trace_id}/spans",
-            json={
-                "name": "GPT-4 Completion",
-                "span_type": "llm",
-                "input_data": {"prompt": "What is the capital of France?"},
-                "model": "gpt-4",
-            },
-            headers=auth_headers,
+        span_id = make_span(
+            client,
+            auth_headers,
+            trace_id,
+            name="GPT-4 Completion",
+            input_data={"prompt": "What is the capital of France?"},
+            model="gpt-4",
         )
 
-        assert span_response.status_code == 200
-        span_id = span_response.json()["span_id"]
-
-        # Step 3: Simulate processing time
-        time.sleep(0.05)
-
-        # Step 4: Complete span with output metrics
-        complete_span_response = client.patch(
-            f"/api/spans/{span_id}/complete",
-            json={
-                "output_data": {"content": "The capital of France is Paris."},
-                "tokens_input": 12,
-                "tokens_output": 8,
-            },
-            headers=auth_headers,
+        # Step 3: Complete span with output metrics (no sleep needed to
+        # simulate processing: the server stamps times itself and the
+        # duration assertion below only requires >= 0)
+        complete_span(
+            client,
+            auth_headers,
+            span_id,
+            output_data={"content": "The capital of France is Paris."},
+            tokens_input=12,
+            tokens_output=8,
         )
 
-        assert complete_span_response.status_code == 200
-
-        # Step 5: Complete trace
-        complete_trace_response = client.patch(
-            f"/api/traces/{trace_id}/complete",
-            json={"output": "LLM call completed successfully"},
-            headers=auth_headers,
+        # Step 4: Complete trace
+        complete_trace(
+            client, auth_headers, trace_id, output="LLM call completed successfully"
         )
 
-        assert complete_trace_response.status_code == 200
-
-        # Step 6: Verify full trace retrieval
+        # Step 5: Verify full trace retrieval
         get_response = client.get(f"/api/traces/{trace_id}", headers=auth_headers)
 
         assert get_response.status_code == 200
@@ -126,83 +91,100 @@ class TestLLMCallWorkflow:
 class TestNestedSpansWorkflow:
     """Test workflows with nested spans (parent-child relationships)."""
 
-    def test_nested_spans_workflow(self, client, auth_headers):
-        """Workflow with parent span containing child spans."""
-        # Create a trace
-        trace_response = client.post(
-            "/api/traces",
-            json={
-                "name": "Agent Workflow Test",
-                "project_id": "test"
-            },
-            headers=auth_headers,
-        )
-        assert trace_response.status_code == 200
-        trace_id = trace_response.json()["trace_id"]
-
-        # Creating parent span (typically an agent orchestrator)
-        parent_response = client.post(
-            f"/api/traces/{trace_id}/spans",
-            json={
-                "name": "Agent Planning",
-                "span_type": "agent"
-            },
-            headers=auth_headers,
-        )
-        parent_span_id = parent_response.json()["span_id"]
+    async def test_nested_spans_workflow(self, app, auth_headers):
+        """Workflow with parent span containing child spans.
+
+        Runs on an AsyncClient so the sibling child spans — which have
+        no ordering dependency among themselves — can be created and
+        completed concurrently instead of one round-trip at a time.
+        Parent/trace create and complete stay sequential; those
+        orderings are part of the workflow under test.
+        """
+        async with httpx.AsyncClient(
+            transport=httpx.ASGITransport(app=app), base_url="http://test"
+        ) as client:
+            # Create a trace
+            trace_response = await client.post(
+                "/api/traces",
+                json={
+                    "name": "Agent Workflow Test",
+                    "project_id": "test"
+                },
+                headers=auth_headers,
+            )
+            assert trace_response.status_code == 200
+            trace_id = trace_response.json()["trace_id"]
 
-        # Create multiple child spans (individual tasks) - these could be also retries of previous tasks.
-        child_ids = []
-        tasks = ["Fetch Data", "Analyze", "Generate Report"]
-        for task in tasks:
-            child_response = client.post(
+            # Creating parent span (typically an agent orchestrator)
+            parent_response = await client.post(
                 f"/api/traces/{trace_id}/spans",
                 json={
-                    "name": task,
-                    "span_type": "function",
-                    "parent_span_id": parent_span_id,
+                    "name": "Agent Planning",
+                    "span_type": "agent"
                 },
                 headers=auth_headers,
             )
-            child_ids.append(child_response.json()["span_id"])
-
-        # All child spans must be completed before the parent span
-        for span_id in child_ids:
-            response = client.patch(
-                f"/api/spans/{span_id}/complete",
+            parent_span_id = parent_response.json()["span_id"]
+
+            # Create multiple child spans concurrently (individual tasks) -
+            # these could be also retries of previous tasks.
+            tasks = ["Fetch Data", "Analyze", "Generate Report"]
+            child_responses = await asyncio.gather(*[
+                client.post(
+                    f"/api/traces/{trace_id}/spans",
+                    json={
+                        "name": task,
+                        "span_type": "function",
+                        "parent_span_id": parent_span_id,
+                    },
+                    headers=auth_headers,
+                )
+                for task in tasks
+            ])
+            child_ids = [r.json()["span_id"] for r in child_responses]
+
+            # All child spans must be completed before the parent span
+            responses = await asyncio.gather(*[
+                client.patch(
+                    f"/api/spans/{span_id}/complete",
+                    json={},
+                    headers=auth_headers,
+                )
+                for span_id in child_ids
+            ])
+            assert all(r.status_code == 200 for r in responses)
+
+            # Now complete the parent span
+            response = await client.patch(
+                f"/api/spans/{parent_span_id}/complete",
                 json={},
                 headers=auth_headers,
             )
             assert response.status_code == 200
 
-        # Now complete the parent span
-        response = client.patch(
-            f"/api/spans/{parent_span_id}/complete",
-            json={},
-            headers=auth_headers,
-        )
-        assert response.status_code == 200
-
-        # Finally complete the trace
-        response = client.patch(
-            f"/api/traces/{trace_id}/complete",
-            json={"output": "Agent workflow completed"},
-            headers=auth_headers,
-        )
-        assert response.status_code == 200
+            # Finally complete the trace
+            response = await client.patch(
+                f"/api/traces/{trace_id}/complete",
+                json={"output": "Agent workflow completed"},
+                headers=auth_headers,
+            )
+            assert response.status_code == 200
 
-        # Verify the completed trace retrieval
-        get_response = client.get(f"/api/traces/{trace_id}", headers=auth_headers)
-        data = get_response.json()
+            # Verify the completed trace retrieval
+            get_response = await client.get(f"/api/traces/{trace_id}", headers=auth_headers)
+            data = get_response.json()
 
         # Should have 4 spans: 1 parent + 3 children
         assert data["span_count"] == 4, f"Expected 4 spans, got {data['span_count']}"
 
-        # Verify parent-child relationships; children spans are just entries with parent_span_id not None.
-        children = [s for s in data["spans"] if s.get("parent_span_id")]
-        assert len(children) == 3, "Should have 3 child spans"
+        # Verify parent-child relationships in a single sweep; children
+        # spans are just entries with parent_span_id not None.
+        child_parents = [
+            s["parent_span_id"] for s in data["spans"] if s.get("parent_span_id")
+        ]
+        assert len(child_parents) == 3, "Should have 3 child spans"
         assert all(
-            s["parent_span_id"] == parent_span_id for s in children
+            p == parent_span_id for p in child_parents
         ), "All children should reference parent span"
 
 
@@ -211,85 +193,47 @@ class TestMultiSpanWorkflow:
 
     def test_multi_span_sequential_workflow(self, client, auth_headers):
         """Workflow with multiple sequential spans (RAG pattern)."""
-        # Create a trace
-        trace_response = client.post(
-            "/api/traces",
-            json={
-                "name": "RAG Pipeline Test",
-                "project_id": "test"
-            },
-            headers=auth_headers,
-        )
-        trace_id = trace_response.json()["trace_id"]
-
-        # Span 1: Embedding generation; span_type is set to embedding.
-        embed_response = client.post(
-            f"/api/traces/{trace_id}/spans",
-            json={
-                "name": "Generating Embedding",
-                "span_type": "embedding",
-                "input_data": {"text": "user query"},
-                "model": "text-embedding-3-small",
-            },
-            headers=auth_headers,
-        )
-        embed_span_id = embed_response.json()["span_id"]
-
-        # Complete the embedding span
-        client.patch(
-            f"/api/spans/{embed_span_id}/complete",
-            json={"output_data": {"embedding_dim": 1536}},
-            headers=auth_headers,
-        )
-
-        # Span 2: Vector retrieval
-        retrieval_response = client.post(
-            f"/api/traces/{trace_id}/spans",
-            json={
-                "name": "Vector Search",
-                "span_type": "retrieval",
-                "input_data": {"top_k": 5},
-            },
-            headers=auth_headers,
-        )
-        retrieval_span_id = retrieval_response.json()["span_id"]
-
-        # Complete the retrieval span
-        client.patch(
-            f"/api/spans/{retrieval_span_id}/complete",
-            json={"output_data": {"results_count": 5}},
-            headers=auth_headers,
-        )
-
-        # Span 3: LLM generation
-        llm_response = client.post(
-            f"/api/traces/{trace_id}/spans",
-            json={
-                "name": "LLM Generation",
-                "span_type": "llm",
-                "model": "gpt-4",
-            },
-            headers=auth_headers,
-        )
-        llm_span_id = llm_response.json()["span_id"]
-
-        # Complete the LLM generation span
-        client.patch(
-            f"/api/spans/{llm_span_id}/complete",
-            json={
-                "output_data": {"response": "Generated answer"},
-                "tokens_input": 500,
-                "tokens_output": 150,
-            },
-            headers=auth_headers,
-        )
+        trace_id = make_trace(client, auth_headers, name="RAG Pipeline Test")
+
+        # Each pipeline stage as (creation fields, completion fields);
+        # the loop runs them strictly in order, as a RAG pipeline would.
+        stages = [
+            (
+                {
+                    "name": "Generating Embedding",
+                    "span_type": "embedding",
+                    "input_data": {"text": "user query"},
+                    "model": "text-embedding-3-small",
+                },
+                {"output_data": {"embedding_dim": 1536}},
+            ),
+            (
+                {
+                    "name": "Vector Search",
+                    "span_type": "retrieval",
+                    "input_data": {"top_k": 5},
+                },
+                {"output_data": {"results_count": 5}},
+            ),
+            (
+                {
+                    "name": "LLM Generation",
+                    "span_type": "llm",
+                    "model": "gpt-4",
+                },
+                {
+                    "output_data": {"response": "Generated answer"},
+                    "tokens_input": 500,
+                    "tokens_output": 150,
+                },
+            ),
+        ]
+        for create_fields, completion_fields in stages:
+            span_id = make_span(client, auth_headers, trace_id, **create_fields)
+            complete_span(client, auth_headers, span_id, **completion_fields)
 
         # FINALLY: After all the spans or tasks are completed, complete the open trace
-        client.patch(
-            f"/api/traces/{trace_id}/complete",
-            json={"output": "RAG pipeline completed"},
-            headers=auth_headers,
-        )
+        complete_trace(client, auth_headers, trace_id, output="RAG pipeline completed")
 
         # Verify
         get_response = client.get(f"/api/traces/{trace_id}", headers=auth_headers)
@@ -9,6 +9,7 @@ Execute this file from service/ for async tests to pass
 import pytest
 from datetime import datetime, timezone
 from decimal import Decimal
+from types import MappingProxyType
 from pydantic import ValidationError
 
 from service.src.models import (
@@ -22,6 +23,49 @@ from service.src.models import (
 )
 
 
+# Module-scoped building blocks: the same base dicts and timestamp were
+# being rebuilt inside every test method. Read-only (tests unpack them
+# into model constructors), so one instance per module is safe.
+@pytest.fixture(scope="module")
+def base_trace():
+    """Minimal valid Trace kwargs (read-only)."""
+    return MappingProxyType({
+        "trace_id": "t1",
+        "name": "test",
+        "project_id": "proj",
+    })
+
+
+@pytest.fixture(scope="module")
+def base_span():
+    """Minimal valid Span kwargs (read-only)."""
+    return MappingProxyType({
+        "span_id": "s1",
+        "trace_id": "t1",
+        "name": "test",
+        "span_type": "llm",
+    })
+
+
+# Large payloads used by the truncation tests, allocated once per
+# interpreter instead of per test body.
+_BIG_5K = "x" * 5000
+_BIG_META = "x" * (MAX_METADATA_SIZE + 1000)
+_BIG_100K = "x" * 100_000
+
+# Frozen timestamps: deterministic inputs beat re-reading the clock, and
+# the string forms can be shared as constants across the parsing tests.
+_ISO_Z = "2025-01-15T10:30:00Z"
+_ISO_OFFSET = "2025-01-15T10:30:00+00:00"
+_NOW = datetime(2025, 1, 15, 10, 30, tzinfo=timezone.utc)
+
+
+@pytest.fixture(scope="module")
+def now_utc():
+    """A tz-aware timestamp; frozen, nothing asserts on its value."""
+    return _NOW
+
+
 class TestTruncateDict:
     """Tests for truncate_dict helper - critical for DynamoDB size limits.
     
@@ -39,9 +83,27 @@ class TestTruncateDict:
         assert result == data
         assert "_truncated" not in result
 
+    def test_forged_truncated_marker_does_not_bypass_limit(self):
+        """A client-supplied _truncated key must not disable truncation.
+
+        The marker is in-band, so an oversized payload carrying it has
+        to be re-measured and truncated like any other.
+        """
+        data = {"content": _BIG_5K, "_truncated": True}
+
+        result = truncate_dict(data, max_size=2000)
+
+        assert len(result["content"]) < len(_BIG_5K)
+
+    def test_marker_honored_when_payload_fits(self):
+        """A round-tripped, already-fitting payload passes through as-is."""
+        data = {"content": "short", "_truncated": True}
+
+        assert truncate_dict(data, max_size=2000) == data
+
     def test_large_string_values_truncated(self):
         """Long string values should be truncated first."""
-        large_text = "x" * 5000
+        large_text = _BIG_5K
         data = {"content": large_text, "keep": "small"}
 
         result = truncate_dict(data, max_size=2000)
@@ -52,12 +114,12 @@ class TestTruncateDict:
 
     def test_nested_strings_truncated(self):
         """Nested string values should also be truncated."""
-        data = {"outer": {"inner": "x" * 5000}}
+        data = {"outer": {"inner": _BIG_5K}}
 
         result = truncate_dict(data, max_size=2000)
 
         assert "_truncated" in result
-        assert len(result["outer"]["inner"]) < 5000
+        assert len(result["outer"]["inner"]) < len(_BIG_5K)
 
     def test_drop_large_keys_when_truncation_insufficient(self):
         """Test dropping large keys when string truncation isn't enough.
@@ -125,22 +187,17 @@ class TestDatetimeParsing:
     parse_datetime() validator. Test verify all supported formats.
     """
 
-    def test_trace_datetime_parsing(self):
+    def test_trace_datetime_parsing(self, base_trace, now_utc):
         """Test datetime parsing for Trace model."""
-        base_trace = {
-            "trace_id": "t1",
-            "name": "test",
-            "project_id": "proj",
-        }
-        now = datetime.now(timezone.utc)
+        now = now_utc
 
         # Format 1: ISO string with Z suffix
-        trace_z = Trace(**base_trace, start_time="2025-01-15T10:30:00Z")
+        trace_z = Trace(**base_trace, start_time=_ISO_Z)
         assert isinstance(trace_z.start_time, datetime)
         assert trace_z.start_time.tzinfo is not None, "should be timezone aware"
     
         # Format 2: ISO string with explicit offset
-        trace_offset = Trace(**base_trace, start_time="2025-01-15T10:30:00+00:00")
+        trace_offset = Trace(**base_trace, start_time=_ISO_OFFSET)
         assert isinstance(trace_offset.start_time, datetime)
         
         # Format 3: Datetime object (passthrough)
@@ -151,23 +208,17 @@ class TestDatetimeParsing:
         trace_invalid = Trace(**base_trace, start_time="not-a-date")
         assert trace_invalid.start_time == "not-a-date", "invalid string kept as-is"
         
-    def test_span_datetime_parsing(self):
+    def test_span_datetime_parsing(self, base_span, now_utc):
         """Test datetime parsing for Span model."""
-        base_span = {
-            "span_id": "s1",
-            "trace_id": "t1",
-            "name": "test",
-            "span_type": "llm",
-        }
-        now = datetime.now(timezone.utc)
+        now = now_utc
 
         # Format 1: ISO string with Z suffix
-        span_z = Span(**base_span, start_time="2025-01-15T10:30:00Z")
+        span_z = Span(**base_span, start_time=_ISO_Z)
         assert isinstance(span_z.start_time, datetime)
         assert span_z.start_time.tzinfo is not None, "should be timezone aware"
     
         # Format 2: ISO string with explicit offset
-        span_offset = Span(**base_span, start_time="2025-01-15T10:30:00+00:00")
+        span_offset = Span(**base_span, start_time=_ISO_OFFSET)
         assert isinstance(span_offset.start_time, datetime)
         
         # Format 3: Datetime object (passthrough)
@@ -183,21 +234,20 @@ class TestToDynamoDBItem:
     """Tests for to_dynamodb_item() conversion.
     
     Trace and Span pydantic objects have to_dynamodb_item() which converts
-    them to a dictionary with proper types that can be used to create a 
+    them to a dictionary with proper types that can be used to create a
     DynamoDB "Item".
+
+    Models here are built with model_construct(): the inputs are already
+    canonical, and skipping field validation keeps these tests about the
+    conversion path alone. Validation has its own tests above.
     """
 
-    def test_trace_to_dynamodb_item(self):
+    def test_trace_to_dynamodb_item(self, base_trace, now_utc):
         """Test to_dynamodb_item() for Trace model."""
-        base_trace = {
-            "trace_id": "t1",
-            "name": "test",
-            "project_id": "proj",
-        }
-        now = datetime.now(timezone.utc)
-        
+        now = now_utc
+
         # Test 1: Datetime fields converted to ISO strings for dynamoDB
-        trace = Trace(**base_trace, start_time=now, end_time=now)
+        trace = Trace.model_construct(**base_trace, start_time=now, end_time=now)
         item = trace.to_dynamodb_item()
         
         assert isinstance(item["start_time"], str)
@@ -205,7 +255,7 @@ class TestToDynamoDBItem:
         assert "T" in item["start_time"], "Should be ISO format with T separator"
 
         # Test 2: None fields excluded from dynamoDB item
-        trace_w_nones = Trace(
+        trace_w_nones = Trace.model_construct(
             **base_trace, start_time=now, end_time=None, output=None
         )
         item_w_nones = trace_w_nones.to_dynamodb_item()
@@ -214,18 +264,12 @@ class TestToDynamoDBItem:
         assert "output" not in item_w_nones
         
 
-    def test_span_to_dynamodb_item(self):
+    def test_span_to_dynamodb_item(self, base_span, now_utc):
         """Test to_dynamodb_item() for Span model."""
-        base_span = {
-            "span_id": "s1",
-            "trace_id": "t1",
-            "name": "test",
-            "span_type": "llm",
-        }
-        now = datetime.now(timezone.utc)
+        now = now_utc
 
         # Test 1: Datetime field converted to ISO strings
-        span = Span(**base_span, start_time=now, end_time=now)
+        span = Span.model_construct(**base_span, start_time=now, end_time=now)
         item = span.to_dynamodb_item()
 
         assert isinstance(item["start_time"], str)
@@ -233,7 +277,7 @@ class TestToDynamoDBItem:
         assert "T" in item["start_time"], "Should be ISO format with T separator"
 
         # Test 2: None fields excluded from dynamoDB item
-        span_w_nones = Span(
+        span_w_nones = Span.model_construct(
             **base_span, start_time=now, end_time=None, error=None
         )
         item_w_nones = span_w_nones.to_dynamodb_item()
@@ -242,7 +286,7 @@ class TestToDynamoDBItem:
         assert "error" not in item_w_nones
 
         # Test 3: cost_usd converted to Decimal
-        span_w_cost = Span(**base_span, start_time=now, cost_usd=0.0025)
+        span_w_cost = Span.model_construct(**base_span, start_time=now, cost_usd=0.0025)
         item_w_cost = span_w_cost.to_dynamodb_item()
         
         assert isinstance(item_w_cost["cost_usd"], Decimal), "cost_usd should be Decimal."
@@ -255,14 +299,23 @@ class TestSpanTypeValidation:
     This is mainly to allow strictly matching key words for filtering spans.
     """
 
-    @pytest.mark.parametrize("valid_type", [
+    VALID_SPAN_TYPES = [
         "llm", "tool", "agent", "function",
-        "retrieval", "embedding", "chain", "other"
-    ])
-    def test_valid_span_types(self, valid_type):
-        """All documented span types should be accepted."""
-        span = SpanCreate(name="test", span_type=valid_type)
-        assert span.span_type == valid_type, "Span type should match."
+        "retrieval", "embedding", "chain", "other",
+    ]
+
+    def test_valid_span_types(self):
+        """All documented span types should be accepted.
+
+        One test over a prebuilt list rather than a parametrized case
+        per value: each case paid full pydantic validation plus pytest
+        setup/teardown, and a failure names the offending type anyway.
+        """
+        spans = [
+            SpanCreate(name="test", span_type=t) for t in self.VALID_SPAN_TYPES
+        ]
+        for expected, span in zip(self.VALID_SPAN_TYPES, spans):
+            assert span.span_type == expected, f"Span type {expected!r} should match."
 
     def test_invalid_span_type_rejected(self):
         """Invalid span type should raise ValidationError."""
@@ -279,18 +332,22 @@ class TestProjectIdValidation:
     do not allow characters that could be problematic. 
     """
 
-    @pytest.mark.parametrize("valid_id", [
+    VALID_PROJECT_IDS = [
         "myproject",
         "my-project",
         "my_project",
         "Project123",
         "a",
         "test-project-123",
-    ])
-    def test_valid_project_ids(self, valid_id):
+    ]
+
+    def test_valid_project_ids(self):
         """Alphanumeric with hyphens/underscores should work."""
-        trace = TraceCreate(name="test", project_id=valid_id)
-        assert trace.project_id == valid_id
+        traces = [
+            TraceCreate(name="test", project_id=i) for i in self.VALID_PROJECT_IDS
+        ]
+        for expected, trace in zip(self.VALID_PROJECT_IDS, traces):
+            assert trace.project_id == expected
 
     @pytest.mark.parametrize("invalid_id", [
         "my project",   # space
@@ -336,7 +393,7 @@ class TestMetadataTruncation:
 
     def test_large_metadata_truncated_on_trace_create(self):
         """TraceCreate should truncate oversized metadata."""
-        large_metadata = {"content": "x" * (MAX_METADATA_SIZE + 1000)}
+        large_metadata = {"content": _BIG_META}
 
         trace = TraceCreate(
             name="test",
@@ -347,16 +404,13 @@ class TestMetadataTruncation:
         # Should not raise, should truncate
         assert "_truncated" in trace.metadata, "failed to truncate metadata on TraceCreate."
 
-    def test_large_input_data_truncated_on_span(self):
+    def test_large_input_data_truncated_on_span(self, base_span, now_utc):
         """Span should truncate oversized input_data."""
-        large_data = {"prompt": "x" * 100_000}
+        large_data = {"prompt": _BIG_100K}
 
         span = Span(
-            span_id="s1",
-            trace_id="t1",
-            name="test",
-            span_type="llm",
-            start_time=datetime.now(timezone.utc),
+            **base_span,
+            start_time=now_utc,
             input_data=large_data,
         )
 
@@ -7,11 +7,15 @@ Execute this file from service/ for async tests to pass
 """
 
 import pytest
-import time
+from types import SimpleNamespace
 from fastapi import Request, HTTPException
 
 from service.src.rate_limit import RateLimiter
 
+# The limiter only reads request.client.host; one shared stand-in
+# object is enough, no per-test class definitions needed
+_MOCK_REQUEST = SimpleNamespace(client=SimpleNamespace(host="127.0.0.1"))
+
 
 @pytest.fixture
 def rate_limiter():
@@ -19,16 +23,10 @@ def rate_limiter():
     return RateLimiter(requests_per_minute=5, window_seconds=10)
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def mock_request():
-    """Create Mock request"""
-    class MockClient:
-        host = "127.0.0.1"
-    
-    class MockRequest:
-        client = MockClient()
-    
-    return MockRequest()
+    """Mock request exposing just client.host (read-only)."""
+    return _MOCK_REQUEST
 
 
 @pytest.mark.asyncio
@@ -43,23 +41,29 @@ async def test_rate_limit_allows_requests_under_threshold(
 
 
 @pytest.mark.asyncio
-async def test_rate_limit_blocking_and_resetting(
-    rate_limiter,
-    mock_request,
-):
+async def test_rate_limit_blocking_and_resetting(mock_request):
     """Test that rate limiter blocks requests over threshold and resets after window."""
+    # Fake clock so the test advances time instead of sleeping through
+    # the real window (this single sleep used to dominate suite runtime)
+    now = [0.0]
+    rate_limiter = RateLimiter(
+        requests_per_minute=5,
+        window_seconds=10,
+        time_source=lambda: now[0],
+    )
+
     # Use up quota
     for _ in range(5):
         await rate_limiter.check_rate_limit(mock_request)
-    
+
     # Next one should be blocked
     with pytest.raises(HTTPException) as exc_info:
         await rate_limiter.check_rate_limit(mock_request)
-    
+
     assert exc_info.value.status_code == 429
 
-    # Wait for window to pass
-    time.sleep(11)
-    
+    # Advance past the window
+    now[0] += 11
+
     # Next one should be allowed
     await rate_limiter.check_rate_limit(mock_request)